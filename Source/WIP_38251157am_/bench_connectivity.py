@@ -0,0 +1,72 @@
+"""Connectivity benchmark - the BFS in find_path against the bitboard flood fill
+
+Times both ways of answering "is the circuit complete?" on random boards
+of a few sizes, checks they always agree and reports the smallest size
+from which the bitboard is faster (circuit_complete switches backends at
+BITBOARD_MIN_CELLS). Exits with status 1 if they ever disagree:
+
+    python bench_connectivity.py --sizes 6 8 10 20 40 --boards 200
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+import circuit_logic
+
+
+def time_backend(check, boards, repeats):
+    """Median microseconds per board for check(board, rotations)"""
+    times = []
+    for board, rotations in boards:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            check(board, rotations)
+        times.append((time.perf_counter() - start) * 1e6 / repeats)
+    return statistics.median(times)
+
+
+def bfs_complete(board, rotations):
+    return circuit_logic.find_path(board, rotations) is not None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the connectivity backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4, 6, 8, 10, 15, 20, 30, 40])
+    parser.add_argument("--boards", type=int, default=100, help="random boards per size")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    crossover = None
+    failed = False
+    for size in args.sizes:
+        # Half plain random boards, half with a route planted so both answers turn up
+        boards = [circuit_logic.generate_board(size, rng) for _ in range(args.boards // 2)]
+        boards += [circuit_logic.generate_solvable_board(size, rng)[::2]
+                   for _ in range(args.boards - len(boards))]
+        mismatches = sum(bfs_complete(board, rotations)
+                         != circuit_logic.circuit_complete_bitboard(board, rotations)
+                         for board, rotations in boards)
+        bfs_us = time_backend(bfs_complete, boards, args.repeats)
+        bitboard_us = time_backend(circuit_logic.circuit_complete_bitboard, boards, args.repeats)
+        if bitboard_us < bfs_us and crossover is None:
+            crossover = size
+        if mismatches:
+            failed = True
+        status = f"{mismatches} MISMATCHES" if mismatches else "agree"
+        print(f"{size}x{size}: bfs {bfs_us:.1f} us, bitboard {bitboard_us:.1f} us "
+              f"({bfs_us / bitboard_us:.1f}x) [{status}]")
+
+    if crossover is None:
+        print("bitboard never faster")
+    else:
+        print(f"bitboard faster from {crossover}x{crossover} "
+              f"(circuit_complete switches at {circuit_logic.BITBOARD_MIN_CELLS} blocks)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
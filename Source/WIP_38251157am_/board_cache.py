@@ -0,0 +1,97 @@
+"""Zobrist hashing of board states and a bounded LRU cache keyed by them"""
+import random
+from collections import OrderedDict
+
+import circuit_logic
+
+
+class ZobristHasher:
+    """64-bit Zobrist hash of (board, rotations) for one board shape
+
+    Every (cell, piece, rotation) gets a random 64-bit key and a board's
+    hash is the XOR of the keys of its cells, so rotating one block only
+    needs two XORs to update the hash.
+    """
+
+    def __init__(self, rows, cols, seed=0x5EED):
+        rng = random.Random(seed ^ (rows << 16) ^ cols)
+        self.rows = rows
+        self.cols = cols
+        self.piece_index = {name: i for i, name in enumerate(circuit_logic.PIECE_NAMES)}
+        # keys[row][col][piece][rotation]
+        self.keys = [[[[rng.getrandbits(64) for _ in range(4)]
+                       for _ in circuit_logic.PIECE_NAMES]
+                      for _ in range(cols)]
+                     for _ in range(rows)]
+
+    def hash_board(self, board, rotations):
+        """Full hash of a board, O(cells)"""
+        h = 0
+        for i in range(self.rows):
+            for j in range(self.cols):
+                h ^= self.keys[i][j][self.piece_index[board[i][j]]][rotations[i][j]]
+        return h
+
+    def rotate(self, h, row, col, piece_type, old_rotation, new_rotation):
+        """Hash after the block at (row, col) turned from old_rotation to new_rotation, O(1)"""
+        cell_keys = self.keys[row][col][self.piece_index[piece_type]]
+        return h ^ cell_keys[old_rotation] ^ cell_keys[new_rotation]
+
+
+_hashers = {}
+
+
+def hasher_for(rows, cols):
+    """Shared ZobristHasher for a board shape"""
+    hasher = _hashers.get((rows, cols))
+    if hasher is None:
+        hasher = _hashers[(rows, cols)] = ZobristHasher(rows, cols)
+    return hasher
+
+
+class LRUCache:
+    """Bounded least-recently-used cache"""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self.data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.maxsize:
+            self.data.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self.data
+
+    def __len__(self):
+        return len(self.data)
+
+    def clear(self):
+        self.data.clear()
+
+
+MISSING = object()  # get() default that can't be confused with a cached None
+
+# Results keyed by (kind, rows, cols, hash), e.g. ('path', 6, 6, h) for
+# find_path. A solver can store its own sub-results here as a
+# transposition table under its own kind.
+BOARD_CACHE = LRUCache(maxsize=8192)
+
+
+def cache_key(kind, board, h):
+    """Cache key for a result of `kind` on a board with Zobrist hash h"""
+    return (kind, len(board), len(board[0]), h)
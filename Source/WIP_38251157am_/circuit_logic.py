@@ -0,0 +1,502 @@
+"""Puzzle logic for Data Connector (no Tk imports, safe to load anywhere)"""
+import hashlib
+import heapq
+import random
+import struct
+from collections import deque
+
+import metrics
+
+# Circuit piece types (connections in 4 directions: North, East, South, West)
+PIECE_TYPES = {
+    'straight_h': [False, True, False, True],    # Horizontal line
+    'straight_v': [True, False, True, False],    # Vertical line
+    'corner_ne': [True, True, False, False],     # Corner North-East
+    'corner_se': [False, True, True, False],     # Corner South-East
+    'corner_sw': [False, False, True, True],     # Corner South-West
+    'corner_nw': [True, False, False, True],     # Corner North-West
+    'cross': [True, True, True, True],           # Cross (all directions)
+    't_shape_n': [True, True, False, True],      # T-shape with top
+    't_shape_e': [True, True, True, False],      # T-shape with right
+    't_shape_s': [False, True, True, True],      # T-shape with bottom
+    't_shape_w': [True, False, True, True],      # T-shape with left
+}
+
+PIECE_NAMES = list(PIECE_TYPES.keys())
+
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # N, E, S, W
+
+
+def rotated_connections(piece_type, rotation):
+    """Get the connections for a piece after rotation"""
+    connections = PIECE_TYPES[piece_type].copy()
+    # Rotate connections (each rotation is 90 degrees clockwise)
+    for _ in range(rotation):
+        connections = [connections[3]] + connections[:-1]
+    return connections
+
+
+def entry_point(board):
+    """(row, col) of the IN block - middle row, left side"""
+    return len(board) // 2, 0
+
+
+def exit_point(board):
+    """(row, col) of the OUT block - middle row, right side"""
+    return len(board) // 2, len(board[0]) - 1
+
+
+def generate_board(size, rng=random):
+    """Generate a size x size board of random pieces, returns (board, rotations)"""
+    board = []
+    rotations = []
+
+    for i in range(size):
+        row = []
+        rot_row = []
+        for j in range(size):
+            # Choose random piece type
+            row.append(rng.choice(PIECE_NAMES))
+            # Random initial rotation
+            rot_row.append(rng.randint(0, 3))
+        board.append(row)
+        rotations.append(rot_row)
+
+    # Ensure there are entry and exit points (straight pieces on the middle row)
+    entry_row, entry_col = entry_point(board)
+    board[entry_row][entry_col] = 'straight_h'
+    rotations[entry_row][entry_col] = 0
+
+    exit_row, exit_col = exit_point(board)
+    board[exit_row][exit_col] = 'straight_h'
+    rotations[exit_row][exit_col] = 0
+
+    metrics.PUZZLES_GENERATED.inc()
+    return board, rotations
+
+
+def _flood(board, rotations, start, cells):
+    """Grow `cells` in place with everything connected to `start`"""
+    rows = len(board)
+    cols = len(board[0])
+    stack = [start]
+    cells.add(start)
+    while stack:
+        row, col = stack.pop()
+        connections = rotated_connections(board[row][col], rotations[row][col])
+        for direction in range(4):
+            if not connections[direction]:
+                continue
+            dr, dc = DIRECTIONS[direction]
+            new_row, new_col = row + dr, col + dc
+            if not (0 <= new_row < rows and 0 <= new_col < cols):
+                continue
+            if (new_row, new_col) in cells:
+                continue
+            # The neighbour has to point back at us for power to flow
+            back = rotated_connections(board[new_row][new_col], rotations[new_row][new_col])
+            if back[(direction + 2) % 4]:
+                cells.add((new_row, new_col))
+                stack.append((new_row, new_col))
+    return cells
+
+
+def powered_cells(board, rotations, entry_rows=None):
+    """Set of blocks that power from IN can reach
+
+    `entry_rows` are the rows fed from the west edge (just IN by default).
+    """
+    if entry_rows is None:
+        entry_rows = (entry_point(board)[0],)
+    cells = set()
+    for row in entry_rows:
+        # An entry block that doesn't face west isn't fed
+        if (row, 0) not in cells and rotated_connections(board[row][0], rotations[row][0])[3]:
+            _flood(board, rotations, (row, 0), cells)
+    return cells
+
+
+class PoweredRegion:
+    """Keeps the powered set up to date one rotation at a time"""
+
+    def __init__(self, board, rotations, entry_rows=None):
+        self.reset(board, rotations, entry_rows)
+
+    def reset(self, board, rotations, entry_rows=None):
+        """Start over on a new board"""
+        self.board = board
+        self.rotations = rotations
+        if entry_rows is None:
+            entry_rows = (entry_point(board)[0],)
+        self.entry_rows = tuple(entry_rows)
+        self.cells = powered_cells(board, rotations, self.entry_rows)
+
+    def rotated(self, row, col):
+        """Update after the block at (row, col) was rotated, returns the blocks that changed state"""
+        old = self.cells
+        if (row, col) in old:
+            # A powered block may have cut the region, so flood again
+            new = powered_cells(self.board, self.rotations, self.entry_rows)
+        elif self._touches_power(row, col):
+            # An unpowered block can only add to the region, from itself outwards
+            new = _flood(self.board, self.rotations, (row, col), set(old))
+        else:
+            return set()
+        self.cells = new
+        return old ^ new
+
+    def _touches_power(self, row, col):
+        """True if the block now links up with a powered neighbour (or IN)"""
+        connections = rotated_connections(self.board[row][col], self.rotations[row][col])
+        if col == 0 and row in self.entry_rows and connections[3]:
+            return True
+        for direction in range(4):
+            if not connections[direction]:
+                continue
+            dr, dc = DIRECTIONS[direction]
+            neighbour = (row + dr, col + dc)
+            if neighbour in self.cells:
+                back = rotated_connections(self.board[neighbour[0]][neighbour[1]],
+                                           self.rotations[neighbour[0]][neighbour[1]])
+                if back[(direction + 2) % 4]:
+                    return True
+        return False
+
+
+# Seeded puzzle stream
+#
+# Every puzzle is identified by (seed, index). Each one gets its own RNG
+# derived from a hash of the pair, so puzzles can be regenerated on their
+# own and parallel workers on different index ranges never share state.
+
+PUZZLE_ID = struct.Struct('<QQ')  # 16 bytes: seed, index
+MASK_64 = (1 << 64) - 1
+
+
+def puzzle_rng(seed, index):
+    """Independent random.Random for puzzle `index` of stream `seed`"""
+    key = PUZZLE_ID.pack(seed & MASK_64, index & MASK_64)
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return random.Random(int.from_bytes(digest, 'little'))
+
+
+def generate_puzzle(seed, index, size=6):
+    """Regenerate puzzle (seed, index), returns (board, rotations)"""
+    return generate_board(size, puzzle_rng(seed, index))
+
+
+def puzzle_stream(seed, size=6, start=0, stop=None):
+    """Lazily yield (index, board, rotations) for indices start..stop (forever if stop is None)"""
+    index = start
+    while stop is None or index < stop:
+        board, rotations = generate_puzzle(seed, index, size)
+        yield index, board, rotations
+        index += 1
+
+
+def pack_puzzle_id(seed, index):
+    """Pack (seed, index) into the 16 bytes needed to regenerate a puzzle"""
+    return PUZZLE_ID.pack(seed & MASK_64, index & MASK_64)
+
+
+def unpack_puzzle_id(data):
+    """Inverse of pack_puzzle_id, returns (seed, index)"""
+    return PUZZLE_ID.unpack(data)
+
+
+def rotations_connecting(piece_type, dir_a, dir_b):
+    """Rotations of a piece that connect both directions"""
+    return [rotation for rotation in range(4)
+            if rotated_connections(piece_type, rotation)[dir_a]
+            and rotated_connections(piece_type, rotation)[dir_b]]
+
+
+def random_route(start, goal, rows, first_col, last_col, rng):
+    """Random simple route of cells from start to goal within columns first_col..last_col (randomised DFS)"""
+    parent = {start: None}
+    stack = [start]
+    while stack:
+        cell = stack.pop()
+        if cell == goal:
+            break
+        neighbours = []
+        for dr, dc in DIRECTIONS:
+            new_cell = (cell[0] + dr, cell[1] + dc)
+            if (0 <= new_cell[0] < rows and first_col <= new_cell[1] <= last_col
+                    and new_cell not in parent):
+                neighbours.append(new_cell)
+        rng.shuffle(neighbours)
+        for new_cell in neighbours:
+            parent[new_cell] = cell
+            stack.append(new_cell)
+    route = []
+    cell = goal
+    while cell is not None:
+        route.append(cell)
+        cell = parent[cell]
+    return list(reversed(route))
+
+
+def plant_route(size, rng):
+    """Random simple route of cells from IN to OUT (randomised DFS)"""
+    entry = (size // 2, 0)
+    exit_ = (size // 2, size - 1)
+    # The route leaves IN heading east and reaches OUT from the west, like
+    # the straight pieces generate_board puts there
+    start = (entry[0], 1)
+    goal = (exit_[0], size - 2)
+    return [entry] + random_route(start, goal, size, 1, size - 2, rng) + [exit_]
+
+
+def direction_between(a, b):
+    """Direction index of the step from cell a to neighbouring cell b"""
+    return DIRECTIONS.index((b[0] - a[0], b[1] - a[1]))
+
+
+def lay_route(board, rotations, solution, route, rng):
+    """Put pieces that can follow the route on route[1:-1], scrambled in `rotations`
+
+    The first and last cells of `route` only give the directions in and
+    out; they may lie off the board.
+    """
+    for k in range(1, len(route) - 1):
+        row, col = route[k]
+        dir_in = direction_between(route[k], route[k - 1])
+        dir_out = direction_between(route[k], route[k + 1])
+        candidates = [name for name in PIECE_NAMES
+                      if rotations_connecting(name, dir_in, dir_out)]
+        piece_type = rng.choice(candidates)
+        board[row][col] = piece_type
+        solution[row][col] = rng.choice(rotations_connecting(piece_type, dir_in, dir_out))
+        rotations[row][col] = rng.randint(0, 3)
+
+
+def generate_solvable_board(size, rng=random):
+    """Generate a board with a known solution, returns (board, rotations, solution)
+
+    A random route from IN to OUT is planted first, with pieces that can
+    be turned to follow it; `solution` is `rotations` with the route
+    blocks turned to match. The board is certified by checking the
+    solution with circuit_complete.
+    """
+    if size < 3:
+        raise ValueError("solvable boards need a size of at least 3")
+    board, rotations = generate_board(size, rng)
+    solution = [row[:] for row in rotations]
+    lay_route(board, rotations, solution, plant_route(size, rng), rng)
+
+    if not circuit_complete(board, solution):
+        raise RuntimeError("planted route did not certify")
+    return board, rotations, solution
+
+
+# Routing
+#
+# Searches run over (block, side) states - "the route comes into this
+# block through this side" - rather than over blocks, so parents always
+# give a route that can really be walked, with every block connecting to
+# the ones before and after it. A route starts by coming into IN from
+# the west and ends in OUT, which has to face the OUT connector to the
+# east. One search is a BFS over at most 4 states per block.
+
+def _route_blocks(states, cols):
+    """(row, col) of each block along a route of states"""
+    return [divmod(state >> 2, cols) for state in states]
+
+
+class RouteSearch:
+    """Routes from IN on one board: the shortest to OUT, and everything reachable"""
+
+    def __init__(self, board, rotations, entry_row=None, exit_row=None):
+        self.rows = len(board)
+        self.cols = len(board[0])
+        if entry_row is None:
+            entry_row, _ = entry_point(board)
+        if exit_row is None:
+            exit_row, _ = exit_point(board)
+        self.connections = [rotated_connections(piece, rotation)
+                            for board_row, rot_row in zip(board, rotations)
+                            for piece, rotation in zip(board_row, rot_row)]
+        entry = entry_row * self.cols
+        self.exit_block = exit_row * self.cols + self.cols - 1
+        # State = block * 4 + side it was come into by
+        self.start = entry * 4 + 3 if self.connections[entry][3] else None
+        self.parent = {}    # Reached state -> the state before it (None for start)
+        self.goal = None    # Nearest state that completes the circuit
+        if self.start is not None:
+            self._search()
+
+    def _moves(self, state):
+        """States one block on from `state`"""
+        block = state >> 2
+        side = state & 3
+        row, col = divmod(block, self.cols)
+        connections = self.connections
+        for out, (dr, dc) in enumerate(DIRECTIONS):
+            if out == side or not connections[block][out]:
+                continue
+            new_row, new_col = row + dr, col + dc
+            if 0 <= new_row < self.rows and 0 <= new_col < self.cols:
+                neighbour = new_row * self.cols + new_col
+                back = (out + 2) % 4
+                if connections[neighbour][back]:
+                    yield neighbour * 4 + back
+
+    def _is_goal(self, state):
+        return state >> 2 == self.exit_block and self.connections[self.exit_block][1]
+
+    def _search(self):
+        parent = self.parent
+        parent[self.start] = None
+        queue = deque([self.start])
+        while queue:
+            state = queue.popleft()
+            if self.goal is None and self._is_goal(state):
+                self.goal = state
+            for move in self._moves(state):
+                if move not in parent:
+                    parent[move] = state
+                    queue.append(move)
+
+    def _states_to(self, state, parent):
+        states = []
+        while state is not None:
+            states.append(state)
+            state = parent[state]
+        states.reverse()
+        return states
+
+    @property
+    def route(self):
+        """Shortest route as a list of (row, col) from IN to OUT, None if there is none"""
+        if self.goal is None:
+            return None
+        return _route_blocks(self._states_to(self.goal, self.parent), self.cols)
+
+    @property
+    def cells(self):
+        """Every block reachable from IN"""
+        return {divmod(state >> 2, self.cols) for state in self.parent}
+
+    @property
+    def edges(self):
+        """Every link between two blocks reachable from IN, as ((row, col), (row, col)) in reading order"""
+        edges = set()
+        for state in self.parent:
+            here = divmod(state >> 2, self.cols)
+            for move in self._moves(state):
+                there = divmod(move >> 2, self.cols)
+                edges.add((here, there) if here < there else (there, here))
+        return edges
+
+    def k_shortest(self, k):
+        """Up to k shortest routes that visit no block twice, shortest first (Yen's algorithm)"""
+        if self.goal is None or k < 1:
+            return []
+        routes = [self._states_to(self.goal, self.parent)]
+        seen = {tuple(routes[0])}
+        candidates = []  # Heap of (length, tie-break, states)
+        while len(routes) < k:
+            last = routes[-1]
+            for i in range(len(last) - 1):
+                root = last[:i + 1]
+                # Moves already taken after this root, and blocks it has used
+                banned_moves = {route[i + 1] for route in routes if route[:i + 1] == root}
+                banned_blocks = {state >> 2 for state in root}
+                spur = self._spur(root[-1], banned_blocks, banned_moves)
+                if spur is not None:
+                    candidate = root[:-1] + spur
+                    if tuple(candidate) not in seen:
+                        seen.add(tuple(candidate))
+                        heapq.heappush(candidates, (len(candidate), len(seen), candidate))
+            if not candidates:
+                break
+            routes.append(heapq.heappop(candidates)[2])
+        return [_route_blocks(route, self.cols) for route in routes]
+
+    def _spur(self, start, banned_blocks, banned_moves):
+        """Shortest states from start to OUT avoiding banned blocks and first moves, or None"""
+        parent = {start: None}
+        queue = deque([start])
+        while queue:
+            state = queue.popleft()
+            if self._is_goal(state):
+                return self._states_to(state, parent)
+            for move in self._moves(state):
+                if move in parent or move >> 2 in banned_blocks:
+                    continue
+                if state == start and move in banned_moves:
+                    continue
+                parent[move] = state
+                queue.append(move)
+        return None
+
+
+def find_path(board, rotations):
+    """Shortest route of blocks from left entry to right exit, None if the circuit isn't complete"""
+    return RouteSearch(board, rotations).route
+
+
+find_path = metrics.timed(metrics.FIND_PATH_SECONDS, find_path)
+
+
+# Bitboard connectivity
+#
+# Whole-board flood fill on Python ints, for when only "is it complete?"
+# matters. Each block gets one byte, so the four direction masks are
+# built in C with bytes.translate; block (i, j) is byte i * (cols + 1) + j
+# and the spare byte at the end of every row stays zero, so nothing
+# shifts across from one row into the next.
+
+PIECE_CODES = {name: index * 4 for index, name in enumerate(PIECE_NAMES)}
+PAD_CODE = 255
+# Per direction, byte code (piece index * 4 + rotation) -> 1 if it connects that way
+DIRECTION_TABLES = [bytes(int(code < 4 * len(PIECE_NAMES)
+                              and rotated_connections(PIECE_NAMES[code >> 2], code & 3)[direction])
+                          for code in range(256))
+                    for direction in range(4)]
+BITBOARD_MIN_CELLS = 9  # From bench_connectivity.py - bitboard ahead from 3x3 up
+
+
+def board_bitboards(board, rotations):
+    """Masks of the blocks connecting north, east, south and west"""
+    codes = bytearray()
+    for board_row, rot_row in zip(board, rotations):
+        codes.extend(PIECE_CODES[piece] + rotation for piece, rotation in zip(board_row, rot_row))
+        codes.append(PAD_CODE)
+    return [int.from_bytes(codes.translate(table), 'little') for table in DIRECTION_TABLES]
+
+
+def circuit_complete_bitboard(board, rotations):
+    """Same answer as find_path(...) is not None, by flood fill on bitboards"""
+    stride = len(board[0]) + 1
+    entry_row, entry_col = entry_point(board)
+    exit_row, exit_col = exit_point(board)
+    entry = 1 << (8 * (entry_row * stride + entry_col))
+    exit_ = 1 << (8 * (exit_row * stride + exit_col))
+    north, east, south, west = board_bitboards(board, rotations)
+    if not west & entry:
+        return False  # IN block doesn't face the IN connector
+    across = 8           # Shift to the next block east
+    down = 8 * stride    # Shift to the next block south
+    # Links between blocks that face each other, marked on the west / north block
+    link_east = east & (west >> across)
+    link_south = south & (north >> down)
+
+    reach = entry
+    while True:
+        grown = (reach
+                 | ((reach & link_east) << across) | ((reach >> across) & link_east)
+                 | ((reach & link_south) << down) | ((reach >> down) & link_south))
+        if grown == reach:
+            break
+        reach = grown
+    # OUT has to be reached and face the OUT connector
+    return bool(reach & east & exit_)
+
+
+def circuit_complete(board, rotations):
+    """True if there's a complete path from IN to OUT (backend picked by board size)"""
+    if len(board) * len(board[0]) >= BITBOARD_MIN_CELLS:
+        return circuit_complete_bitboard(board, rotations)
+    return find_path(board, rotations) is not None
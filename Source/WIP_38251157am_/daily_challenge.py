@@ -0,0 +1,113 @@
+"""Daily challenge calendar - everyone gets the same puzzle each day
+
+The calendar is built ahead of time (in parallel) into a fixed-stride
+file, so loading today's puzzle is one seek and one read:
+
+    python daily_challenge.py --out daily_calendar.bin --start 2026-01-01 --days 365
+
+File layout (little endian):
+    header  magic 'DCAL', version, board size, first day (date ordinal),
+            number of days, calendar seed
+    records one per day, size * size bytes each, one byte per block:
+            piece index * 4 + rotation
+"""
+import argparse
+import datetime
+import os
+import struct
+
+import circuit_logic
+
+MAGIC = b'DCAL'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIIQ')
+DEFAULT_CALENDAR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "daily_calendar.bin")
+
+
+def encode_board(board, rotations):
+    """Pack a board into one byte per block"""
+    return bytes(circuit_logic.PIECE_NAMES.index(piece) * 4 + rotation
+                 for board_row, rot_row in zip(board, rotations)
+                 for piece, rotation in zip(board_row, rot_row))
+
+
+def decode_board(data, size):
+    """Inverse of encode_board, returns (board, rotations)"""
+    if len(data) != size * size or max(data, default=0) >= 4 * len(circuit_logic.PIECE_NAMES):
+        raise ValueError("damaged daily calendar record")
+    board = []
+    rotations = []
+    for i in range(size):
+        row = data[i * size:(i + 1) * size]
+        board.append([circuit_logic.PIECE_NAMES[b >> 2] for b in row])
+        rotations.append([b & 3 for b in row])
+    return board, rotations
+
+
+def daily_puzzle(seed, ordinal, size=6):
+    """Certified-solvable puzzle for one day, returns (board, rotations, solution)"""
+    return circuit_logic.generate_solvable_board(size, circuit_logic.puzzle_rng(seed, ordinal))
+
+
+def _encoded_day(job):
+    """Pool worker - one encoded day record"""
+    seed, ordinal, size = job
+    board, rotations, _ = daily_puzzle(seed, ordinal, size)
+    return encode_board(board, rotations)
+
+
+def build_calendar(path, start, days, seed, size=6, workers=None):
+    """Generate `days` daily puzzles from `start` and write them to path"""
+    from multiprocessing import Pool  # Only the build tool needs it, keep game startup light
+    first = start.toordinal()
+    jobs = [(seed, first + day, size) for day in range(days)]
+    tmp_path = path + ".tmp"
+    with Pool(workers) as pool, open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, first, days, seed))
+        # imap keeps day order, so records land at their fixed offsets
+        for record in pool.imap(_encoded_day, jobs, chunksize=16):
+            f.write(record)
+    os.replace(tmp_path, path)
+
+
+def load_daily_puzzle(path=DEFAULT_CALENDAR, day=None):
+    """Today's (or `day`'s) (board, rotations), or None if it isn't in the calendar"""
+    if day is None:
+        day = datetime.date.today()
+    with open(path, "rb") as f:
+        header = f.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError(f"{path} is too short for a daily calendar")
+        magic, version, size, first, days, seed = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a daily calendar")
+        stride = size * size
+        if os.fstat(f.fileno()).st_size != HEADER.size + days * stride:
+            raise ValueError(f"{path} is truncated or damaged")
+        index = day.toordinal() - first
+        if not 0 <= index < days:
+            return None
+        f.seek(HEADER.size + index * stride)
+        return decode_board(f.read(stride), size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the daily challenge calendar")
+    parser.add_argument("--out", default=DEFAULT_CALENDAR)
+    parser.add_argument("--start", type=datetime.date.fromisoformat,
+                        default=datetime.date(datetime.date.today().year, 1, 1),
+                        help="first day, YYYY-MM-DD (default: 1 January this year)")
+    parser.add_argument("--days", type=int, default=366)
+    parser.add_argument("--seed", type=int, required=True,
+                        help="calendar seed, keep it private")
+    parser.add_argument("--size", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    build_calendar(args.out, args.start, args.days, args.seed, args.size, args.workers)
+    print(f"Wrote {args.days} days from {args.start} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
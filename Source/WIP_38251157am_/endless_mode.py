@@ -0,0 +1,122 @@
+"""Endless mode - one circuit carried east across an unbounded row of chunks
+
+The board is cut into size x size chunks. Chunk k is generated from
+(seed, k) the first time it is needed, with a route planted from the
+seam on its west edge to the seam on its east edge, so every chunk can
+be solved and the route always carries on into the next one. Seam rows
+come from a stream of their own, so the two chunks on either side of a
+seam agree on it without generating each other.
+
+Power crosses a seam only eastward: chunk k is fed at its west seam,
+and the player moves on to chunk k + 1 once power leaves chunk k
+through its east seam. Chunks left behind are kept as they are for a
+little while, then evicted to their rotations packed two bits per block.
+The packed ring is bounded too - the oldest chunks are dropped and would
+just be regenerated fresh - so memory stays the same however far the
+player gets.
+"""
+from collections import OrderedDict
+
+import circuit_logic
+
+SEAM_STREAM = 0x5EA45EA45EA45EA4  # Mixed into the seed for the seam row stream
+
+
+def pack_rotations(rotations):
+    """Rotations packed two bits per block"""
+    flat = [rotation for row in rotations for rotation in row]
+    flat += [0] * (-len(flat) % 4)
+    return bytes(flat[i] | flat[i + 1] << 2 | flat[i + 2] << 4 | flat[i + 3] << 6
+                 for i in range(0, len(flat), 4))
+
+
+def unpack_rotations(data, rows, cols):
+    """Inverse of pack_rotations"""
+    flat = [(byte >> shift) & 3 for byte in data for shift in (0, 2, 4, 6)]
+    return [flat[i * cols:(i + 1) * cols] for i in range(rows)]
+
+
+def seam_row(seed, k, size=6):
+    """Row the route crosses into chunk k on (chunk 0 is fed by IN)"""
+    if k == 0:
+        return size // 2
+    return circuit_logic.puzzle_rng(seed ^ SEAM_STREAM, k).randrange(size)
+
+
+def generate_chunk(seed, k, size=6):
+    """Chunk k of endless board `seed`, returns (board, rotations, solution)"""
+    rng = circuit_logic.puzzle_rng(seed, k)
+    board, rotations = circuit_logic.generate_board(size, rng)
+    solution = [row[:] for row in rotations]
+    entry_row = seam_row(seed, k, size)
+    exit_row = seam_row(seed, k + 1, size)
+    route = circuit_logic.random_route((entry_row, 0), (exit_row, size - 1),
+                                       size, 0, size - 1, rng)
+    # The seams just off either edge give the directions in and out
+    circuit_logic.lay_route(board, rotations, solution,
+                            [(entry_row, -1)] + route + [(exit_row, size)], rng)
+
+    if not leaves_east(board, solution, exit_row,
+                       circuit_logic.powered_cells(board, solution, (entry_row,))):
+        raise RuntimeError("planted route did not certify")
+    return board, rotations, solution
+
+
+def leaves_east(board, rotations, exit_row, cells):
+    """True if power in `cells` goes out through the east seam"""
+    exit_col = len(board[0]) - 1
+    return ((exit_row, exit_col) in cells
+            and circuit_logic.rotated_connections(board[exit_row][exit_col],
+                                                  rotations[exit_row][exit_col])[1])
+
+
+class ChunkedBoard:
+    """The chunks of one endless run, generated on demand and evicted behind the player"""
+
+    def __init__(self, seed, size=6, keep_behind=1, keep_packed=64, lookahead=2):
+        self.seed = seed
+        self.size = size
+        self.keep_behind = keep_behind  # Chunks behind the player kept as they are
+        self.keep_packed = keep_packed  # Evicted chunks kept as packed rotations
+        self.lookahead = lookahead      # Columns from the seam at which the next chunk is made
+        self.current = 0
+        self.live = {}                  # k -> (board, rotations)
+        self.packed = OrderedDict()     # k -> packed rotations, oldest first
+
+    def seam_row(self, k):
+        """Row of the seam on the west edge of chunk k"""
+        return seam_row(self.seed, k, self.size)
+
+    def chunk(self, k):
+        """(board, rotations) of chunk k, made or unpacked if it isn't live"""
+        chunk = self.live.get(k)
+        if chunk is None:
+            board, rotations, _ = generate_chunk(self.seed, k, self.size)
+            packed = self.packed.pop(k, None)
+            if packed is not None:
+                rotations = unpack_rotations(packed, self.size, self.size)
+            chunk = self.live[k] = (board, rotations)
+        return chunk
+
+    def power_changed(self, cells):
+        """Look at the current chunk's powered blocks, True if the player moved on
+
+        The next chunk is made as soon as power gets within `lookahead`
+        columns of the east seam, so it is ready by the time power crosses.
+        """
+        if cells and max(col for _, col in cells) >= self.size - 1 - self.lookahead:
+            self.chunk(self.current + 1)
+        board, rotations = self.chunk(self.current)
+        if not leaves_east(board, rotations, self.seam_row(self.current + 1), cells):
+            return False
+        self.current += 1
+        self._evict()
+        return True
+
+    def _evict(self):
+        """Pack chunks that are far enough behind, and forget the oldest packed ones"""
+        for k in sorted(self.live):
+            if k < self.current - self.keep_behind:
+                self.packed[k] = pack_rotations(self.live.pop(k)[1])
+        while len(self.packed) > self.keep_packed:
+            self.packed.popitem(last=False)
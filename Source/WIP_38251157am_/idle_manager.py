@@ -0,0 +1,117 @@
+"""Idle detection - lets the game stop all periodic work when nobody is looking"""
+import time
+
+
+class IdleManager:
+    """Watches map/unmap, focus and input events on the game's windows
+
+    The game is idle when all its windows are hidden (minimised or
+    withdrawn), it has lost focus, or it has seen no input for `timeout`
+    seconds. on_idle() is called
+    on the way into idle and on_active() on the way out. While idle the
+    manager itself schedules nothing - input events just record a time
+    stamp, and the inactivity timer is a single one-shot `after` that is
+    only re-armed while the window is active.
+    """
+
+    def __init__(self, root, on_idle, on_active, timeout=120.0):
+        self.root = root
+        self.on_idle = on_idle
+        self.on_active = on_active
+        self.timeout = timeout
+        self.hidden = False
+        self.focused = True
+        self.inactive = False
+        self.idle = False
+        self.last_activity = time.monotonic()
+        self.timer_id = None
+        self.windows = {}   # Watched window -> mapped
+
+        self.watch(root)
+        for sequence in ("<Motion>", "<KeyPress>", "<ButtonPress>", "<MouseWheel>"):
+            root.bind_all(sequence, self._on_input, add="+")
+        self._arm_timer(timeout)
+
+    def watch(self, window):
+        """Count window (the root or a Toplevel) as one of the game's windows"""
+        self.windows[window] = True
+        window.bind("<Map>", self._on_map, add="+")
+        window.bind("<Unmap>", self._on_unmap, add="+")
+        window.bind("<FocusIn>", self._on_focus_in, add="+")
+        window.bind("<FocusOut>", self._on_focus_out, add="+")
+        self._update_hidden()
+
+    def unwatch(self, window):
+        """Stop counting a window that is about to be destroyed"""
+        if self.windows.pop(window, None) is not None:
+            self._update_hidden()
+
+    def _on_map(self, event):
+        # Child widgets' events reach the window's bindings too
+        if event.widget in self.windows:
+            self.windows[event.widget] = True
+            self.last_activity = time.monotonic()
+            self._update_hidden()
+
+    def _on_unmap(self, event):
+        if event.widget in self.windows:
+            self.windows[event.widget] = False
+            self._update_hidden()
+
+    def _update_hidden(self):
+        self.hidden = not any(self.windows.values())
+        self._update()
+
+    def _on_focus_in(self, event):
+        self.focused = True
+        self._update()
+
+    def _on_focus_out(self, event):
+        # Focus also moves between our own widgets, so look once it settles
+        self.root.after_idle(self._check_focus)
+
+    def _check_focus(self):
+        try:
+            self.focused = self.root.focus_get() is not None
+        except KeyError:
+            self.focused = True  # Focus is in a dialog of ours (e.g. a messagebox)
+        self._update()
+
+    def _on_input(self, event):
+        self.last_activity = time.monotonic()
+        if self.inactive:
+            self.inactive = False
+            self._update()
+
+    def _arm_timer(self, delay):
+        if self.timer_id is None:
+            self.timer_id = self.root.after(int(delay * 1000) + 1, self._on_timer)
+
+    def _cancel_timer(self):
+        if self.timer_id is not None:
+            self.root.after_cancel(self.timer_id)
+            self.timer_id = None
+
+    def _on_timer(self):
+        self.timer_id = None
+        remaining = self.last_activity + self.timeout - time.monotonic()
+        if remaining > 0:
+            self._arm_timer(remaining)  # There was input since, wait out the rest
+        else:
+            self.inactive = True
+            self._update()
+
+    def _update(self):
+        """Work out the idle state and tell the game if it changed"""
+        idle = self.hidden or not self.focused or self.inactive
+        # Only an active window needs the inactivity timer
+        if idle:
+            self._cancel_timer()
+        else:
+            self._arm_timer(self.timeout)
+        if idle != self.idle:
+            self.idle = idle
+            if idle:
+                self.on_idle()
+            else:
+                self.on_active()
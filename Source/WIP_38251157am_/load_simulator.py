@@ -0,0 +1,149 @@
+"""Synthetic-player load simulator for the login puzzle
+
+Spins up scripted players across a process pool. Each player gets a
+board from the puzzle logic, rotates blocks according to a skill profile
+and submits the board to a verification backend (circuit_complete) until it
+passes or they give up. Everything runs offline against an in-process
+stand-in for the verification server.
+
+    python load_simulator.py --players 5000 --workers 8 --profile mixed
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import circuit_logic
+
+# name -> (chance a move fixes a route block, moves between submissions, give up after)
+SKILL_PROFILES = {
+    'expert': (0.9, 3, 60),
+    'average': (0.6, 5, 150),
+    'novice': (0.3, 8, 400),
+}
+MIXED = ['expert'] * 2 + ['average'] * 5 + ['novice'] * 3
+
+
+class LocalVerifier:
+    """In-process stand-in for the verification backend"""
+
+    def __init__(self):
+        self.latencies = []  # seconds, wall clock per verification
+        self.cpu_times = []  # seconds, CPU per verification
+
+    def verify(self, board, rotations):
+        """Check a submitted board, like the server would"""
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        ok = circuit_logic.circuit_complete(board, rotations)
+        self.cpu_times.append(time.process_time() - cpu)
+        self.latencies.append(time.perf_counter() - wall)
+        return ok
+
+
+def play(player_id, seed, profile, size, verifier):
+    """Run one scripted login, returns (logged_in, moves, submissions)"""
+    rng = circuit_logic.puzzle_rng(seed, player_id)
+    skill, moves_per_submit, give_up = SKILL_PROFILES[profile]
+    board, rotations, solution = circuit_logic.generate_solvable_board(size, rng)
+    cells = [(i, j) for i in range(size) for j in range(size)]
+
+    moves = 0
+    submissions = 0
+    while moves < give_up:
+        for _ in range(moves_per_submit):
+            wrong = [(i, j) for i, j in cells
+                     if board[i][j] != 'cross' and rotations[i][j] != solution[i][j]]
+            if wrong and rng.random() < skill:
+                # A good move - a block of the planted route turned towards its solution
+                row, col = rng.choice(wrong)
+            else:
+                row, col = rng.choice(cells)
+            rotations[row][col] = (rotations[row][col] + 1) % 4
+            moves += 1
+        submissions += 1
+        if verifier.verify(board, rotations):
+            return True, moves, submissions
+    return False, moves, submissions
+
+
+def run_batch(job):
+    """Pool worker - play a batch of players, returns raw measurements"""
+    player_ids, seed, profiles, size = job
+    verifier = LocalVerifier()
+    logins = 0
+    moves = 0
+    for player_id in player_ids:
+        profile = profiles[player_id % len(profiles)]
+        ok, player_moves, _ = play(player_id, seed, profile, size, verifier)
+        logins += ok
+        moves += player_moves
+    return logins, moves, verifier.latencies, verifier.cpu_times
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def simulate(players, workers, profile, size, seed, batch_size=100):
+    """Run the whole office and return a report dict"""
+    profiles = MIXED if profile == 'mixed' else [profile]
+    jobs = [(range(start, min(start + batch_size, players)), seed, profiles, size)
+            for start in range(0, players, batch_size)]
+
+    latencies = []
+    cpu_times = []
+    logins = 0
+    moves = 0
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch_logins, batch_moves, batch_latencies, batch_cpu in pool.map(run_batch, jobs):
+            logins += batch_logins
+            moves += batch_moves
+            latencies.extend(batch_latencies)
+            cpu_times.extend(batch_cpu)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'players': players,
+        'logins': logins,
+        'verifications': len(latencies),
+        'elapsed_s': elapsed,
+        'verifications_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'moves_per_player': moves / players if players else 0.0,
+        'latency_p50_us': percentile(latencies, 0.50) * 1e6,
+        'latency_p95_us': percentile(latencies, 0.95) * 1e6,
+        'latency_p99_us': percentile(latencies, 0.99) * 1e6,
+        'latency_max_us': (latencies[-1] if latencies else 0.0) * 1e6,
+        'cpu_per_verification_us': (statistics.fmean(cpu_times) if cpu_times else 0.0) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Data Connector login load simulator")
+    parser.add_argument("--players", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--profile", default="mixed",
+                        choices=["mixed"] + list(SKILL_PROFILES))
+    parser.add_argument("--size", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=random.getrandbits(32))
+    args = parser.parse_args()
+
+    report = simulate(args.players, args.workers, args.profile, args.size, args.seed)
+    print(f"seed {args.seed}, {args.workers} workers, profile {args.profile}")
+    for name, value in report.items():
+        if isinstance(value, float):
+            print(f"  {name:26} {value:12.1f}")
+        else:
+            print(f"  {name:26} {value:12d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Bandwidth - how many edge-disjoint data routes a board carries from IN to OUT ports
+
+Blocks are the nodes of a flow network. Every pair of neighbouring
+blocks that face each other is an edge that can carry one route, either
+way. A source feeds each IN port block on the west edge that faces west
+and each OUT port block on the east edge that faces east drains into a
+sink, one route per port. The bandwidth is the max flow, found with
+Dinic's algorithm - on unit capacities it needs only O(sqrt(E)) rounds
+of one BFS and a blocking flow each.
+
+    python max_flow.py --size 30 --ports 5 --rotations 1000
+"""
+import argparse
+import random
+import time
+from collections import deque
+
+import circuit_logic
+
+
+class Dinic:
+    """Max flow on a directed graph stored as flat edge arrays
+
+    Edge e runs to `to[e]` with `cap[e]` residual capacity left; edge
+    e ^ 1 is its reverse.
+    """
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.adj = [[] for _ in range(nodes)]
+        self.to = []
+        self.cap = []
+
+    def add_edge(self, u, v, cap, reverse_cap=0):
+        """Edge u -> v (reverse_cap makes it usable v -> u too), returns its index"""
+        edge = len(self.to)
+        self.adj[u].append(edge)
+        self.to.append(v)
+        self.cap.append(cap)
+        self.adj[v].append(edge + 1)
+        self.to.append(u)
+        self.cap.append(reverse_cap)
+        return edge
+
+    def _levels(self, source, sink):
+        """BFS distances from source over edges with capacity left, None if sink is cut off"""
+        level = [-1] * self.nodes
+        level[source] = 0
+        queue = deque([source])
+        to, cap = self.to, self.cap
+        while queue:
+            node = queue.popleft()
+            for edge in self.adj[node]:
+                if cap[edge] and level[to[edge]] < 0:
+                    level[to[edge]] = level[node] + 1
+                    queue.append(to[edge])
+        return level if level[sink] >= 0 else None
+
+    def _augment(self, source, sink, level):
+        """Push one unit along a source-sink path in the level graph, False if there is none"""
+        to, cap, adj, nxt = self.to, self.cap, self.adj, self.next_edge
+        path = []
+        node = source
+        while node != sink:
+            edges = adj[node]
+            while nxt[node] < len(edges):
+                edge = edges[nxt[node]]
+                if cap[edge] and level[to[edge]] == level[node] + 1:
+                    break
+                nxt[node] += 1
+            else:
+                # Dead end, back up and never come here again this round
+                if not path:
+                    return False
+                level[node] = -1
+                edge = path.pop()
+                node = to[edge ^ 1]
+                nxt[node] += 1
+                continue
+            path.append(edge)
+            node = to[edge]
+        for edge in path:
+            cap[edge] -= 1
+            cap[edge ^ 1] += 1
+        return True
+
+    def max_flow(self, source, sink):
+        """Push as much extra flow as fits (unit steps, so for unit-capacity networks)"""
+        flow = 0
+        while True:
+            level = self._levels(source, sink)
+            if level is None:
+                return flow
+            self.next_edge = [0] * self.nodes
+            while self._augment(source, sink, level):
+                flow += 1
+
+
+def port_rows(rows, ports):
+    """Rows for `ports` ports spread evenly down an edge (one port sits on the middle row)"""
+    return [(2 * k + 1) * rows // (2 * ports) for k in range(ports)]
+
+
+def bandwidth(board, rotations, in_rows, out_rows):
+    """Number of edge-disjoint routes from the IN port rows to the OUT port rows"""
+    rows = len(board)
+    cols = len(board[0])
+    source = rows * cols
+    sink = source + 1
+    graph = Dinic(rows * cols + 2)
+    connections = [[circuit_logic.rotated_connections(piece, rotation)
+                    for piece, rotation in zip(board_row, rot_row)]
+                   for board_row, rot_row in zip(board, rotations)]
+    for i in range(rows):
+        for j in range(cols):
+            here = connections[i][j]
+            # East and south neighbours only, so each link is added once
+            if j + 1 < cols and here[1] and connections[i][j + 1][3]:
+                graph.add_edge(i * cols + j, i * cols + j + 1, 1, 1)
+            if i + 1 < rows and here[2] and connections[i + 1][j][0]:
+                graph.add_edge(i * cols + j, (i + 1) * cols + j, 1, 1)
+    for i in in_rows:
+        if connections[i][0][3]:
+            graph.add_edge(source, i * cols, 1)
+    for i in out_rows:
+        if connections[i][cols - 1][1]:
+            graph.add_edge(i * cols + cols - 1, sink, 1)
+    return graph.max_flow(source, sink)
+
+
+class BandwidthScore:
+    """Live bandwidth of a board, kept up to date one rotation at a time"""
+
+    def __init__(self, board, rotations, in_rows, out_rows):
+        self.board = board
+        self.rotations = rotations
+        self.in_rows = list(in_rows)
+        self.out_rows = list(out_rows)
+        self.routes = bandwidth(board, rotations, self.in_rows, self.out_rows)
+
+    @property
+    def most(self):
+        """Best possible score - every port used"""
+        return min(len(self.in_rows), len(self.out_rows))
+
+    def rotated(self, row, col):
+        """Update after the block at (row, col) was turned a quarter clockwise, returns the score
+
+        Solving from scratch takes a few ms even on 30x30 boards, so only
+        turns that leave the block's links unchanged are skipped.
+        """
+        rotation = self.rotations[row][col]
+        if self._links(row, col, rotation) != self._links(row, col, (rotation - 1) % 4):
+            self.routes = bandwidth(self.board, self.rotations, self.in_rows, self.out_rows)
+        return self.routes
+
+    def _links(self, row, col, rotation):
+        """Which sides of the block connect (to a neighbour facing back, or a port) at `rotation`"""
+        rows = len(self.board)
+        cols = len(self.board[0])
+        connections = circuit_logic.rotated_connections(self.board[row][col], rotation)
+        links = []
+        for direction, (dr, dc) in enumerate(circuit_logic.DIRECTIONS):
+            new_row, new_col = row + dr, col + dc
+            if not connections[direction]:
+                links.append(False)
+            elif 0 <= new_row < rows and 0 <= new_col < cols:
+                back = circuit_logic.rotated_connections(self.board[new_row][new_col],
+                                                         self.rotations[new_row][new_col])
+                links.append(back[(direction + 2) % 4])
+            elif direction == 3:
+                links.append(row in self.in_rows)
+            elif direction == 1:
+                links.append(row in self.out_rows)
+            else:
+                links.append(False)
+        return links
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time live bandwidth scoring on random boards")
+    parser.add_argument("--size", type=int, default=30)
+    parser.add_argument("--ports", type=int, default=5)
+    parser.add_argument("--rotations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    board, rotations = circuit_logic.generate_board(args.size, rng)
+    ports = port_rows(args.size, args.ports)
+    score = BandwidthScore(board, rotations, ports, ports)
+    times = []
+    for _ in range(args.rotations):
+        row, col = rng.randrange(args.size), rng.randrange(args.size)
+        rotations[row][col] = (rotations[row][col] + 1) % 4
+        start = time.perf_counter()
+        score.rotated(row, col)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    print(f"{args.size}x{args.size}, {args.ports} ports: score {score.routes}/{score.most}, "
+          f"update median {times[len(times) // 2]:.2f} ms, max {times[-1]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
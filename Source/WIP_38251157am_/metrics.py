@@ -0,0 +1,163 @@
+"""Lightweight metrics for the game and the verification path
+
+Counters and histograms are plain attribute updates (no locks - a lost
+increment under a thread race is acceptable for ops dashboards), so
+recording costs well under a microsecond. The registry renders the
+Prometheus text format, served over local HTTP or rewritten to a file
+for the node exporter's textfile collector.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Seconds - tuned for find_path on boards from 6x6 up to ~30x30
+DEFAULT_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+                   0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+
+
+class Counter:
+    """Monotonic counter"""
+    __slots__ = ('name', 'help', 'value')
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def render(self):
+        return (f"# HELP {self.name} {self.help}\n"
+                f"# TYPE {self.name} counter\n"
+                f"{self.name} {self.value}\n")
+
+
+class Histogram:
+    """Fixed-bucket histogram"""
+    __slots__ = ('name', 'help', 'bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.bounds = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{{le="{bound:g}"}} {cumulative}')
+        lines.append(f'{self.name}_bucket{{le="+Inf"}} {self.count}')
+        lines.append(f"{self.name}_sum {self.sum:.9g}")
+        lines.append(f"{self.name}_count {self.count}")
+        return "\n".join(lines) + "\n"
+
+
+class Registry:
+    """Named collection of metrics"""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def counter(self, name, help_text):
+        if name not in self.metrics:
+            self.metrics[name] = Counter(name, help_text)
+        return self.metrics[name]
+
+    def histogram(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        if name not in self.metrics:
+            self.metrics[name] = Histogram(name, help_text, buckets)
+        return self.metrics[name]
+
+    def render(self):
+        """All metrics in Prometheus text exposition format"""
+        return "".join(metric.render() for metric in self.metrics.values())
+
+
+REGISTRY = Registry()
+
+PUZZLES_GENERATED = REGISTRY.counter(
+    "dataconnector_puzzles_generated_total", "Boards generated")
+FIND_PATH_SECONDS = REGISTRY.histogram(
+    "dataconnector_find_path_seconds", "find_path calls and their duration")
+FAILED_TESTS = REGISTRY.counter(
+    "dataconnector_failed_tests_total", "Test Circuit presses on an incomplete circuit")
+MUSIC_RESTARTS = REGISTRY.counter(
+    "dataconnector_music_thread_starts_total", "Music threads started")
+REDRAWS = REGISTRY.counter(
+    "dataconnector_redraws_total", "Canvas redraw passes")
+
+
+def serve_http(registry=REGISTRY, port=9464, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread, returns the server"""
+    # Imported here, http.server is slow to load and most processes never serve
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # Keep scrapes out of the console
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def write_file(path, registry=REGISTRY):
+    """Atomically rewrite a .prom file with the current values"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(registry.render())
+    os.replace(tmp_path, path)
+
+
+def export_file_periodically(path, interval=15.0, registry=REGISTRY):
+    """Rewrite path every `interval` seconds from a daemon thread, returns a stop Event"""
+    stop = threading.Event()
+
+    def loop():
+        while not stop.wait(interval):
+            write_file(path, registry)
+        write_file(path, registry)
+
+    threading.Thread(target=loop, daemon=True).start()
+    return stop
+
+
+def timed(histogram, fn):
+    """Wrap fn so every call's duration is recorded in histogram"""
+    clock = time.perf_counter
+
+    # wraps() keeps the module/qualname, so the wrapper still pickles by
+    # name for process pools
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            histogram.observe(clock() - start)
+
+    return wrapper
@@ -0,0 +1,249 @@
+"""Headless board renderer - draws boards like the game canvas, without a display
+
+Boards are rasterised into an in-memory RGB buffer and written out as PNG
+or PPM. Each (piece, rotation, highlight) tile is rasterised once and
+then copied row by row into every board that uses it, and banks of
+boards are rendered in parallel:
+
+    python offscreen_render.py --seed 7 --count 10000 --out thumbs --block-size 16
+"""
+import argparse
+import math
+import os
+import struct
+import zlib
+
+import circuit_logic
+
+# Same colours as the Tk canvas
+BACKGROUND = (0x16, 0x21, 0x3e)
+BLOCK = (0x95, 0xa5, 0xa6)
+BLOCK_HIGHLIGHT = (0xb8, 0xc5, 0xc8)
+OUTLINE = (0x7f, 0x8c, 0x8d)
+CONNECTION = (0x2c, 0x3e, 0x50)
+
+
+class Raster:
+    """RGB pixel buffer with the few drawing primitives the board needs"""
+
+    def __init__(self, width, height, color=BACKGROUND):
+        self.width = width
+        self.height = height
+        self.pixels = bytearray(bytes(color) * (width * height))
+
+    def fill_span(self, y, x0, x1, color):
+        """Fill pixels x0..x1-1 of row y"""
+        x0 = max(0, x0)
+        x1 = min(self.width, x1)
+        if 0 <= y < self.height and x0 < x1:
+            start = (y * self.width + x0) * 3
+            self.pixels[start:start + (x1 - x0) * 3] = bytes(color) * (x1 - x0)
+
+    def fill_rounded_rect(self, x0, y0, x1, y1, radius, color):
+        """Filled rectangle with rounded corners, [x0, x1) x [y0, y1)"""
+        for y in range(y0, y1):
+            # How far into a corner this row is
+            if y < y0 + radius:
+                dy = y0 + radius - y - 0.5
+            elif y >= y1 - radius:
+                dy = y - (y1 - radius) + 0.5
+            else:
+                dy = 0
+            inset = radius - int(math.sqrt(max(0.0, radius * radius - dy * dy))) if dy else 0
+            self.fill_span(y, x0 + inset, x1 - inset, color)
+
+    def draw_line(self, x0, y0, x1, y1, width, color):
+        """Thick line segment with round ends, filled one row span at a time"""
+        half = width / 2.0
+        length = math.hypot(x1 - x0, y1 - y0)
+        if length:
+            ux, uy = (x1 - x0) / length, (y1 - y0) / length
+        else:
+            ux, uy = 1.0, 0.0
+        nx, ny = -uy, ux
+        for y in range(int(math.floor(min(y0, y1) - half)), int(math.ceil(max(y0, y1) + half)) + 1):
+            py = y + 0.5
+            lo, hi = math.inf, -math.inf
+            # Round caps at both ends
+            for cx, cy in ((x0, y0), (x1, y1)):
+                dy = py - cy
+                if abs(dy) <= half:
+                    dx = math.sqrt(half * half - dy * dy)
+                    lo, hi = min(lo, cx - dx), max(hi, cx + dx)
+            # The band between them: 0 <= along <= length and |across| <= half
+            band_lo, band_hi = -math.inf, math.inf
+            for coef, offset, low, high in ((ux, (py - y0) * uy, 0.0, length),
+                                            (nx, (py - y0) * ny, -half, half)):
+                # coef * (px - x0) + offset must lie in [low, high]
+                if abs(coef) < 1e-12:
+                    if not low <= offset <= high:
+                        band_lo, band_hi = math.inf, -math.inf
+                    continue
+                a = x0 + (low - offset) / coef
+                b = x0 + (high - offset) / coef
+                band_lo, band_hi = max(band_lo, min(a, b)), min(band_hi, max(a, b))
+            if band_lo <= band_hi:
+                lo, hi = min(lo, band_lo), max(hi, band_hi)
+            if lo <= hi:
+                # Pixels whose centres fall inside [lo, hi]
+                self.fill_span(y, int(math.ceil(lo - 0.5)), int(math.floor(hi - 0.5)) + 1, color)
+
+    def fill_circle(self, cx, cy, radius, color):
+        """Filled disc"""
+        for y in range(int(cy - radius), int(math.ceil(cy + radius)) + 1):
+            dy = y + 0.5 - cy
+            if abs(dy) > radius:
+                continue
+            half = math.sqrt(radius * radius - dy * dy)
+            self.fill_span(y, int(round(cx - half)), int(round(cx + half)), color)
+
+    def blit(self, tile, x, y):
+        """Copy another raster in at (x, y), one row slice at a time"""
+        row_bytes = tile.width * 3
+        for ty in range(tile.height):
+            src = ty * row_bytes
+            dst = ((y + ty) * self.width + x) * 3
+            self.pixels[dst:dst + row_bytes] = tile.pixels[src:src + row_bytes]
+
+    def to_ppm(self):
+        """Binary PPM (P6) bytes"""
+        return b"P6\n%d %d\n255\n" % (self.width, self.height) + bytes(self.pixels)
+
+    def to_png(self, level=6):
+        """PNG bytes (8-bit RGB, no filtering)"""
+        row_bytes = self.width * 3
+        raw = b"".join(b"\x00" + bytes(self.pixels[y * row_bytes:(y + 1) * row_bytes])
+                       for y in range(self.height))
+
+        def chunk(kind, data):
+            body = kind + data
+            return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body))
+
+        header = struct.pack(">IIBBBBB", self.width, self.height, 8, 2, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+                + chunk(b"IDAT", zlib.compress(raw, level)) + chunk(b"IEND", b""))
+
+
+def piece_lines(piece_type, rotation):
+    """Connection lines as (from, to) pairs of 'center' / direction, same rules as draw_circuit_piece"""
+    connections = circuit_logic.rotated_connections(piece_type, rotation)
+    if piece_type == 'straight_h':
+        # The canvas only draws straights when they line up with their own axis
+        return [(3, 1)] if connections[1] and connections[3] else []
+    if piece_type == 'straight_v':
+        return [(0, 2)] if connections[0] and connections[2] else []
+    return [('center', i) for i, conn in enumerate(connections) if conn]
+
+
+def render_tile(piece_type, rotation, block_size, highlight=False, background=BACKGROUND,
+                angle=0.0):
+    """Rasterise one block the way draw_circuit_piece draws it
+
+    `angle` turns the connection lines a further number of degrees
+    clockwise, for in-between frames of a rotation.
+    """
+    scale = block_size / 70.0  # The canvas is laid out for 70 px blocks
+    tile = Raster(block_size, block_size, background)
+    radius = max(1, int(round(12 * scale)))
+    border = max(1, int(round(2 * scale)))
+    tile.fill_rounded_rect(0, 0, block_size, block_size, radius, OUTLINE)
+    tile.fill_rounded_rect(border, border, block_size - border, block_size - border,
+                           max(1, radius - border), BLOCK_HIGHLIGHT if highlight else BLOCK)
+
+    center = block_size / 2.0
+    margin = 10 * scale
+    points = {
+        'center': (center, center),
+        0: (center, margin),                   # North
+        1: (block_size - margin, center),      # East
+        2: (center, block_size - margin),      # South
+        3: (margin, center),                   # West
+    }
+    if angle:
+        cos_a = math.cos(math.radians(angle))
+        sin_a = math.sin(math.radians(angle))
+        for key, (px, py) in points.items():
+            dx, dy = px - center, py - center
+            # Clockwise on screen, where y points down
+            points[key] = (center + dx * cos_a - dy * sin_a, center + dx * sin_a + dy * cos_a)
+    line_width = max(1.0, 4 * scale)
+    for start, end in piece_lines(piece_type, rotation):
+        tile.draw_line(*points[start], *points[end], line_width, CONNECTION)
+    # Center dot
+    tile.fill_circle(center, center, max(1.0, 3 * scale), CONNECTION)
+    return tile
+
+
+_tile_cache = {}
+
+
+def cached_tile(piece_type, rotation, block_size, highlight=False):
+    """render_tile, but each distinct tile is only rasterised once per process"""
+    key = (piece_type, rotation, block_size, highlight)
+    tile = _tile_cache.get(key)
+    if tile is None:
+        tile = _tile_cache[key] = render_tile(piece_type, rotation, block_size, highlight)
+    return tile
+
+
+def render_board(board, rotations, block_size=70, gap=5, highlight_power=True):
+    """Rasterise a whole board like update_display"""
+    rows = len(board)
+    cols = len(board[0])
+    step = block_size + gap
+    image = Raster(cols * step - gap, rows * step - gap)
+    powered = circuit_logic.powered_cells(board, rotations) if highlight_power else ()
+    for i in range(rows):
+        for j in range(cols):
+            tile = cached_tile(board[i][j], rotations[i][j], block_size, (i, j) in powered)
+            image.blit(tile, j * step, i * step)
+    return image
+
+
+def write_image(image, path, fmt="png"):
+    """Write a raster as .png or .ppm"""
+    with open(path, "wb") as f:
+        f.write(image.to_png() if fmt == "png" else image.to_ppm())
+
+
+def _render_batch(job):
+    """Pool worker - render and write one batch of (seed, index) puzzles"""
+    seed, indices, size, out_dir, fmt, block_size = job
+    for index in indices:
+        board, rotations = circuit_logic.generate_puzzle(seed, index, size)
+        image = render_board(board, rotations, block_size, gap=max(1, block_size // 14))
+        write_image(image, os.path.join(out_dir, f"puzzle_{seed}_{index:06d}.{fmt}"), fmt)
+    return len(indices)
+
+
+def render_bank(seed, start, count, out_dir, size=6, fmt="png", block_size=16,
+                workers=None, batch_size=250):
+    """Render puzzles start..start+count of a seeded stream to out_dir"""
+    from multiprocessing import Pool  # The game only renders single tiles, keep its startup light
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(seed, range(first, min(first + batch_size, start + count)),
+             size, out_dir, fmt, block_size)
+            for first in range(start, start + count, batch_size)]
+    with Pool(workers) as pool:
+        return sum(pool.imap_unordered(_render_batch, jobs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render board thumbnails without a display")
+    parser.add_argument("--seed", type=int, required=True)
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--size", type=int, default=6)
+    parser.add_argument("--out", default="thumbnails")
+    parser.add_argument("--format", choices=["png", "ppm"], default="png")
+    parser.add_argument("--block-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    done = render_bank(args.seed, args.start, args.count, args.out, args.size,
+                       args.format, args.block_size, args.workers)
+    print(f"Rendered {done} boards to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""Par - the fewest right-clicks that wire IN to OUT, by transfer-matrix DP
+
+Every right-click turns one block a quarter turn clockwise, so turning a
+block from rotation r0 to r costs (r - r0) % 4 clicks. A solved board
+needs a simple route of blocks from IN to OUT where each block on the
+route connects to the blocks before and after it (IN facing the IN
+connector, OUT facing the OUT connector). Blocks off the route can stay
+as they are, so par is the cheapest such route.
+
+The DP sweeps the board column by column, one block at a time, top to
+bottom. Its state is the set of route edges crossing the frontier
+between finished and unfinished blocks (one slot per row, plus the
+edge below the last finished block), each labelled as:
+
+    0  no route edge
+    1  upper end of a route piece with both ends on the frontier
+    2  lower end of such a piece
+    3  the end of the piece that starts at IN
+
+Brackets 1/2 pair up like parentheses, which is enough to merge pieces
+when they meet and to rule out loops. For each state only the cheapest
+click count is kept.
+
+To keep the state count down every sweep runs under a click limit.
+States whose clicks so far plus the cheapest walk from the frontier to
+OUT already reach the limit are dropped. The limit starts just above
+that walk's cost from IN - a lower bound on par - and is raised until
+a route turns up; a quick sweep with no route pieces heading back west
+gives an upper bound to stop at.
+
+    python par_solver.py --rows 10 --cols 40 --count 50
+"""
+import argparse
+import heapq
+import math
+import random
+import time
+
+import circuit_logic
+
+NONE, OPEN, CLOSE, SOURCE = 0, 1, 2, 3
+NORTH, EAST, SOUTH, WEST = 0, 1, 2, 3
+
+
+def pair_costs(piece_type, rotation):
+    """Clicks to connect each pair of directions, {(dir_a, dir_b): clicks} (only pairs it can make)"""
+    costs = {}
+    for turns in range(4):
+        connections = circuit_logic.rotated_connections(piece_type, (rotation + turns) % 4)
+        for a in range(4):
+            for b in range(a + 1, 4):
+                if connections[a] and connections[b] and (a, b) not in costs:
+                    costs[(a, b)] = turns
+    return costs
+
+
+def _get(state, slot):
+    return (state >> (2 * slot)) & 3
+
+
+def _set(state, slot, label):
+    return state & ~(3 << (2 * slot)) | (label << (2 * slot))
+
+
+def _partner(state, slot):
+    """Slot of the bracket matching the one at `slot`"""
+    label = _get(state, slot)
+    step = 1 if label == OPEN else -1
+    depth = 0
+    while True:
+        slot += step
+        other = _get(state, slot)
+        if other == label:
+            depth += 1
+        elif other == OPEN + CLOSE - label:
+            if depth == 0:
+                return slot
+            depth -= 1
+
+
+def _pair(a, b):
+    return (a, b) if a < b else (b, a)
+
+
+def walk_costs(costs, exit_row):
+    """Cheapest clicks from entering each block from each side to OUT, {(row, col, side): clicks}
+
+    Routes here may cross themselves, so this is a lower bound on the
+    clicks a real (simple) route needs.
+    """
+    rows = len(costs)
+    cols = len(costs[0])
+    best = {}
+    heap = []
+    for came in (NORTH, SOUTH, WEST):
+        clicks = costs[exit_row][cols - 1].get(_pair(came, EAST))
+        if clicks is not None:
+            heapq.heappush(heap, (clicks, exit_row, cols - 1, came))
+    while heap:
+        clicks, row, col, came = heapq.heappop(heap)
+        if (row, col, came) in best:
+            continue
+        best[(row, col, came)] = clicks
+        # Step back out of this block through the side we came in by
+        dr, dc = circuit_logic.DIRECTIONS[came]
+        prev_row, prev_col = row + dr, col + dc
+        if not (0 <= prev_row < rows and 0 <= prev_col < cols):
+            continue
+        out = (came + 2) % 4
+        for prev_came in range(4):
+            if prev_came != out and (prev_row, prev_col, prev_came) not in best:
+                step = costs[prev_row][prev_col].get(_pair(prev_came, out))
+                if step is not None:
+                    heapq.heappush(heap, (clicks + step, prev_row, prev_col, prev_came))
+    return best
+
+
+def par(board, rotations, entry_row=None, exit_row=None):
+    """Fewest right-clicks from `rotations` to a wired board, None if it can't be wired
+
+    IN and OUT are on the middle row unless other rows are given.
+    """
+    costs = [[pair_costs(piece, rotation) for piece, rotation in zip(board_row, rot_row)]
+             for board_row, rot_row in zip(board, rotations)]
+    if entry_row is None:
+        entry_row, _ = circuit_logic.entry_point(board)
+    if exit_row is None:
+        exit_row, _ = circuit_logic.exit_point(board)
+    to_exit = walk_costs(costs, exit_row)
+    lower = to_exit.get((entry_row, 0, WEST))
+    if lower is None:
+        return None  # Not even a walk gets there
+    upper = _sweep(costs, to_exit, entry_row, exit_row, math.inf, eastward=True)
+    most = 3 * len(board) * len(board[0])  # No route can cost more
+    step = 1
+    while True:
+        limit = lower + step
+        if upper is not None:
+            limit = min(limit, upper)
+        best = _sweep(costs, to_exit, entry_row, exit_row, limit, eastward=False)
+        if best is not None:
+            return best
+        if upper is not None and limit == upper:
+            return upper
+        if limit > most:
+            return None
+        step *= 2
+
+
+def _sweep(costs, to_exit, entry_row, exit_row, limit, eastward):
+    """The frontier DP, cheapest route below `limit` clicks or None
+
+    With `eastward` only the IN piece is ever on the frontier, so routes
+    never turn back west.
+    """
+    rows = len(costs)
+    cols = len(costs[0])
+
+    # Slots 0..rows: while doing block (i, c), slot i is the edge coming
+    # down into it and slot i + 1 the edge coming in from the west.
+    # Slots above i already hold east edges of column c.
+    states = {SOURCE << (2 * (entry_row + 1)): 0}
+    for c in range(cols):
+        for i in range(rows):
+            cell_costs = costs[i][c]
+            # What this block charges to turn between each pair of sides
+            # (None if it can't); the route comes in from the north or west
+            # and leaves east or south
+            north_east = cell_costs.get(_pair(NORTH, EAST))
+            north_south = cell_costs.get(_pair(NORTH, SOUTH))
+            west_east = cell_costs.get(_pair(WEST, EAST))
+            west_south = cell_costs.get(_pair(WEST, SOUTH))
+            east_south = None if eastward else cell_costs.get(_pair(EAST, SOUTH))
+            north_west = cell_costs.get(_pair(NORTH, WEST))
+            # Nothing may leave the east edge except at OUT, or the bottom edge at all
+            if c == cols - 1 and i != exit_row:
+                north_east = west_east = east_south = None
+            if i == rows - 1:
+                north_south = west_south = east_south = None
+            shift = 2 * i
+            new_states = {}
+
+            def push(state, cost):
+                if cost < new_states.get(state, cost + 1):
+                    new_states[state] = cost
+
+            for state, total in states.items():
+                up = (state >> shift) & 3
+                left = (state >> (shift + 2)) & 3
+                rest = state & ~(15 << shift)
+                if not up and not left:
+                    push(rest, total)
+                    if east_south is not None:
+                        push(rest | (OPEN << shift) | (CLOSE << (shift + 2)), total + east_south)
+                elif not up or not left:
+                    # Carry the route on, out east or south
+                    label = up or left
+                    to_east, to_south = (north_east, north_south) if up else (west_east, west_south)
+                    if to_east is not None:
+                        push(rest | (label << shift), total + to_east)
+                    if to_south is not None:
+                        push(rest | (label << (shift + 2)), total + to_south)
+                elif north_west is not None:
+                    # Two pieces meet here and join up
+                    if up == OPEN and left == CLOSE:
+                        continue  # Same piece, would close a loop
+                    if up == SOURCE or left == SOURCE:
+                        bracket = i + 1 if up == SOURCE else i
+                        rest = _set(rest, _partner(state, bracket), SOURCE)
+                    elif up == OPEN and left == OPEN:
+                        rest = _set(rest, _partner(state, i + 1), OPEN)
+                    elif up == CLOSE and left == CLOSE:
+                        rest = _set(rest, _partner(state, i), CLOSE)
+                    push(rest, total + north_west)
+            # The last stretch of the route into OUT starts at one of the
+            # frontier edges (the IN piece's, or the far end of a piece it
+            # joins on the way), so the cheapest walk from any of them is a
+            # lower bound on what is left to pay
+            if c == cols - 1:
+                plug_costs = [0 if k == exit_row else None for k in range(i + 1)]
+            else:
+                plug_costs = [to_exit.get((k, c + 1, WEST)) for k in range(i + 1)]
+            plug_costs.append(to_exit.get((i + 1, c, NORTH)))
+            plug_costs.extend(to_exit.get((k, c, WEST)) for k in range(i + 1, rows))
+            # useful[b]: mask of the slots that can reach OUT for less than b clicks
+            useful = [0]
+            for cost, k in sorted((cost, k) for k, cost in enumerate(plug_costs) if cost is not None):
+                while len(useful) <= cost + 1:
+                    useful.append(useful[-1])
+                useful[cost + 1] |= 3 << (2 * k)
+            states = {}
+            for state, total in new_states.items():
+                budget = limit - total
+                if budget > 0 and state & (useful[budget] if budget < len(useful) else useful[-1]):
+                    states[state] = total
+        # Next column: east edges become west edges, nothing comes down into row 0
+        states = {state << 2: total for state, total in states.items()}
+
+    return states.get(SOURCE << (2 * (exit_row + 1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Work out par for random boards and time it")
+    parser.add_argument("--rows", type=int, default=6)
+    parser.add_argument("--cols", type=int, default=6)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    times = []
+    for _ in range(args.count):
+        board = [[rng.choice(circuit_logic.PIECE_NAMES) for _ in range(args.cols)]
+                 for _ in range(args.rows)]
+        rotations = [[rng.randint(0, 3) for _ in range(args.cols)] for _ in range(args.rows)]
+        start = time.perf_counter()
+        result = par(board, rotations)
+        times.append((time.perf_counter() - start) * 1000)
+        print(f"par {result}  ({times[-1]:.1f} ms)")
+    times.sort()
+    print(f"{args.rows}x{args.cols}: median {times[len(times) // 2]:.1f} ms, max {times[-1]:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
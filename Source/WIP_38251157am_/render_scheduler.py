@@ -0,0 +1,69 @@
+"""Coalesced redraw scheduling for the puzzle canvas"""
+import time
+
+import metrics
+
+
+class RenderScheduler:
+    """Collects dirty keys and redraws them in one idle pass per frame
+
+    Keys are whatever the render callback understands - the game uses
+    (row, col) for board cells and 'packet' for the data packet. However
+    many times something is marked dirty between frames, it is drawn once,
+    and flushes never happen more often than the display refresh rate.
+    """
+
+    def __init__(self, root, render, refresh_rate=60):
+        self.root = root
+        self.render = render  # render(dirty_keys, full)
+        self.frame_interval = 1.0 / refresh_rate
+        self.dirty = set()
+        self.full = False
+        self.pending_id = None
+        self.last_flush = 0.0
+
+    def mark_dirty(self, key):
+        """Queue one key for the next frame"""
+        self.dirty.add(key)
+        self._schedule()
+
+    def mark_all_dirty(self):
+        """Queue a full redraw for the next frame"""
+        self.full = True
+        self._schedule()
+
+    def _schedule(self):
+        """Make sure exactly one flush is pending"""
+        if self.pending_id is not None:
+            return
+        wait = self.last_flush + self.frame_interval - time.monotonic()
+        if wait > 0:
+            # Too soon after the last frame, hold off until the next one
+            self.pending_id = self.root.after(int(wait * 1000) + 1, self._flush)
+        else:
+            self.pending_id = self.root.after_idle(self._flush)
+
+    def _flush(self):
+        """Draw everything that piled up since the last frame"""
+        self.pending_id = None
+        self.last_flush = time.monotonic()
+        dirty, full = self.dirty, self.full
+        self.dirty = set()
+        self.full = False
+        if dirty or full:
+            metrics.REDRAWS.inc()
+            self.render(dirty, full)
+
+    def flush_now(self):
+        """Draw pending changes immediately (e.g. before a screenshot)"""
+        self.cancel()
+        self._flush()
+
+    def cancel(self):
+        """Drop the pending flush, e.g. when the canvas is destroyed"""
+        if self.pending_id is not None:
+            try:
+                self.root.after_cancel(self.pending_id)
+            except Exception:
+                pass
+            self.pending_id = None
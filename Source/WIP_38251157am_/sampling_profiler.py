@@ -0,0 +1,109 @@
+"""Sampling profiler - cheap enough to leave wired into the game
+
+While a capture runs, a daemon thread wakes every `interval` seconds,
+reads the current frame of each watched thread with
+sys._current_frames() and counts the stack it is in. Stacks are written
+out collapsed, one "thread;outer;...;inner count" line per stack, which
+flamegraph.pl, speedscope and inferno all read as they are.
+
+Nothing runs between captures. A capture stops by itself after
+`duration` seconds and counts at most `max_stacks` distinct stacks
+(samples of any further stacks are only counted as dropped), so neither
+time nor memory grow without bound.
+"""
+import os
+import sys
+import threading
+import time
+
+
+def frame_label(code):
+    """Flame graph label for a code object: function (file:line)"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the stacks of a few named threads into collapsed-stack counts"""
+
+    def __init__(self, threads, interval=0.005, duration=30.0, max_stacks=5000, max_depth=64):
+        self.threads = threads          # name -> callable returning the Thread (or None) to sample
+        self.interval = interval
+        self.duration = duration
+        self.max_stacks = max_stacks
+        self.max_depth = max_depth
+        self.counts = {}                # collapsed stack -> samples
+        self.samples = 0
+        self.dropped = 0
+        self.path = None
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, path, duration=None):
+        """Start a capture that is written to path when it ends, False if one is running"""
+        if self.running:
+            return False
+        self.counts = {}
+        self.samples = 0
+        self.dropped = 0
+        self.path = path
+        self.stop_event.clear()
+        deadline = time.monotonic() + (self.duration if duration is None else duration)
+        self.thread = threading.Thread(target=self._run, args=(deadline,),
+                                       name="sampling-profiler", daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self, wait=True):
+        """End the capture early (it still gets written out)"""
+        self.stop_event.set()
+        if wait and self.running:
+            self.thread.join()
+
+    def _run(self, deadline):
+        codes = {}  # code object -> label, so each function is formatted once
+        while not self.stop_event.is_set() and time.monotonic() < deadline:
+            frames = sys._current_frames()
+            for name, get_thread in self.threads.items():
+                thread = get_thread()
+                frame = frames.get(thread.ident) if thread is not None else None
+                if frame is not None:
+                    self._count(name, frame, codes)
+            del frames  # Don't keep other threads' frames alive while we sleep
+            self.stop_event.wait(self.interval)
+        self.write()
+
+    def _count(self, name, frame, codes):
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            code = frame.f_code
+            label = codes.get(code)
+            if label is None:
+                label = codes[code] = frame_label(code)
+            stack.append(label)
+            frame = frame.f_back
+        stack.append(name)
+        key = ";".join(reversed(stack))
+        self.samples += 1
+        if key in self.counts:
+            self.counts[key] += 1
+        elif len(self.counts) < self.max_stacks:
+            self.counts[key] = 1
+        else:
+            self.dropped += 1
+
+    def write(self):
+        """Write the collapsed stacks to self.path"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+            if self.dropped:
+                f.write(f"[dropped - too many distinct stacks] {self.dropped}\n")
+        os.replace(tmp_path, self.path)
@@ -1,11 +1,634 @@
-import tkinter as tk
-from tkinter import messagebox
+import datetime
+import itertools
+import os
 import random
-import math
 import threading
 import time
+
+import board_cache
+import circuit_logic
+import daily_challenge
+import endless_mode
+from idle_manager import IdleManager
+import max_flow
+import metrics
+import par_solver
+from render_scheduler import RenderScheduler
+from rotation_animation import RotationAnimator, RotationFrames
+from sampling_profiler import SamplingProfiler
+from task_executor import TaskExecutor
+
+# Tk is only loaded once a window is requested, so the puzzle logic can be
+# imported (and forked) cheaply on display-less hosts.
+tk = None
+messagebox = None
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+
+
+def _load_tk():
+    """Import tkinter on first use"""
+    global tk, messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import messagebox as tk_messagebox
+        tk = tkinter
+        messagebox = tk_messagebox
+    return tk
+
+
+class GameSession:
+    """One player's game - board, rotations, animation and status
+
+    Sessions only hold per-player state and widgets. The Tk root, music,
+    worker pool, rotation frames, piece tables and result caches all
+    belong to the DataConnectorGame application and are shared.
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, app, parent, window=None):
+        self.app = app
+        self.root = app.root
+        self.parent = parent    # Widget the game screen is packed into
+        self.window = window    # Our own Toplevel, or None for the main window
+        self.session_id = next(self._ids)
+
+        # Game settings
+        self.size = app.size
+        self.block_size = app.block_size
+        self.gap = app.gap
+
+        # Circuit piece types (connections in 4 directions: North, East, South, West)
+        self.piece_types = circuit_logic.PIECE_TYPES
+
+        # Initialize game variables
+        self.board = []
+        self.rotations = []
+        # Puzzles come from a seeded stream so any board can be replayed
+        # from (puzzle_seed, puzzle_index)
+        self.puzzle_seed = random.getrandbits(64)
+        self.puzzle_index = -1
+        self.packet_pos = None
+        self.packet_path = []
+        self.animation_id = None
+        self.animation_callback = None
+        self.animation_due = 0.0
+        self.animation_paused = None  # (callback, ms left) while idle
+        self.packet_index = 0
+        self.renderer = None
+        self.rotator = None
+        self.powered = None  # PoweredRegion, blocks reachable from IN
+        self.board_hash = 0  # Zobrist hash of (board, rotations)
+        self.entry_row = self.size // 2
+        self.exit_row = self.size // 2
+        self.endless = None  # ChunkedBoard while playing endless mode
+        self.ports = None  # IN/OUT port rows in bandwidth mode
+        self.bandwidth = None  # BandwidthScore in bandwidth mode
+        self.par = None  # Fewest clicks that solve the board, once worked out
+        self.clicks = 0
+        self.puzzle_id = None  # Which board is on screen, e.g. ("daily", day ordinal)
+        self.solved = False  # Set once the board on screen has been recorded
+        self.attempts = []  # (puzzle id, clicks, par) per solved board
+
+        self.create_game_widgets()
+
+    def task_key(self, name):
+        """Key for this session's jobs on the shared task executor"""
+        return (self.session_id, name)
+
+    def create_game_widgets(self):
+        """Create the game interface widgets"""
+        # Back to title button (extra windows just close instead)
+        if self.window is None:
+            back_btn = tk.Button(self.parent, text="← TITLE",
+                                command=self.app.show_title_screen,
+                                font=("Arial", 10, "bold"),
+                                bg='#666666', fg='white',
+                                padx=10, pady=2)
+        else:
+            back_btn = tk.Button(self.parent, text="✕ CLOSE",
+                                command=lambda: self.app.close_session(self),
+                                font=("Arial", 10, "bold"),
+                                bg='#666666', fg='white',
+                                padx=10, pady=2)
+        back_btn.place(x=10, y=10)
+
+        # Title
+        title = tk.Label(self.parent, text="DATA CONNECTOR",
+                        font=("Impact", 18, "bold"),
+                        bg='#1a1a2e', fg='#00ff88')
+        title.pack(pady=10)
+
+        # Instructions
+        instructions = tk.Label(self.parent,
+                               text="Right-click blocks to rotate • Connect left to right for data flow",
+                               font=("Arial", 10),
+                               bg='#1a1a2e', fg='#888888')
+        instructions.pack(pady=5)
+
+        # Game frame
+        self.game_frame = tk.Frame(self.parent, bg='#16213e', bd=2, relief='raised')
+        self.game_frame.pack(padx=20, pady=10)
+
+        # Create canvas for the puzzle
+        canvas_size = self.size * (self.block_size + self.gap) - self.gap
+        self.canvas = tk.Canvas(self.game_frame,
+                               width=canvas_size,
+                               height=canvas_size,
+                               bg='#16213e', highlightthickness=0)
+        self.canvas.pack(padx=10, pady=10)
+
+        # All drawing goes through the scheduler, one pass per frame
+        self.renderer = RenderScheduler(self.root, self.flush_redraw)
+
+        # Rotations play as cached frames swapped on one image item per block
+        self.rotator = RotationAnimator(self.root, self.canvas, self.app.rotation_frames,
+                                        self.cell_origin)
+
+        # Bind events
+        self.canvas.bind("<Button-3>", self.on_right_click)  # Right click to rotate
+        self.canvas.bind("<Button-1>", self.on_left_click)   # Left click for selection
+
+        # Control buttons
+        button_frame = tk.Frame(self.parent, bg='#1a1a2e')
+        button_frame.pack(pady=10)
+
+        test_btn = tk.Button(button_frame, text="Test Circuit",
+                            command=self.test_circuit,
+                            font=("Arial", 12, "bold"),
+                            bg='#0066cc', fg='white',
+                            padx=20, pady=5)
+        test_btn.pack(side=tk.LEFT, padx=5)
+
+        new_btn = tk.Button(button_frame, text="New Puzzle",
+                           command=self.generate_puzzle,
+                           font=("Arial", 12, "bold"),
+                           bg='#cc6600', fg='white',
+                           padx=20, pady=5)
+        new_btn.pack(side=tk.LEFT, padx=5)
+
+        # Music toggle in game
+        music_text = "♪ ON" if self.app.music_enabled else "♪ OFF"
+        self.music_btn = tk.Button(button_frame, text=music_text,
+                                  command=self.app.toggle_music,
+                                  font=("Arial", 10, "bold"),
+                                  bg='#444444', fg='white',
+                                  padx=15, pady=5)
+        self.music_btn.pack(side=tk.LEFT, padx=5)
+
+        # Status label
+        self.status_label = tk.Label(self.parent, text="Right-click blocks to rotate them",
+                                    font=("Arial", 11),
+                                    bg='#1a1a2e', fg='#00ff88')
+        self.status_label.pack(pady=5)
+
+        # Clicks against par
+        self.score_label = tk.Label(self.parent, text="",
+                                   font=("Arial", 10),
+                                   bg='#1a1a2e', fg='#888888')
+        self.score_label.pack()
+
+    def update_music_button(self):
+        """Show the shared music setting on this session's button"""
+        self.music_btn.config(text="♪ ON" if self.app.music_enabled else "♪ OFF")
+
+    def generate_puzzle(self):
+        """Generate a new puzzle with random pieces"""
+        if self.endless is not None:
+            self.start_endless()
+            return
+        self.puzzle_index += 1
+        puzzle_id = ("bandwidth" if self.ports else "classic", self.puzzle_seed, self.puzzle_index)
+        # Any test still running is for the old board
+        self.app.tasks.cancel(self.task_key("test"))
+        self.app.tasks.submit(self.task_key("generate"), circuit_logic.generate_puzzle,
+                              (self.puzzle_seed, self.puzzle_index, self.size),
+                              on_done=lambda puzzle: self.load_puzzle(puzzle, puzzle_id=puzzle_id))
+
+    def load_daily_puzzle(self):
+        """Load today's shared puzzle from the precomputed calendar"""
+        day = datetime.date.today()
+        try:
+            puzzle = daily_challenge.load_daily_puzzle(day=day)
+        except (OSError, ValueError):
+            puzzle = None
+        if puzzle is None or len(puzzle[0]) != self.size:
+            # Calendar missing or out of date, fall back to a random board
+            self.generate_puzzle()
+            self.status_label.config(text="No daily challenge today - random puzzle instead")
+            return
+        self.load_puzzle(puzzle, puzzle_id=("daily", day.toordinal()))
+        self.status_label.config(text="Daily challenge - same puzzle for everyone today")
+
+    def start_endless(self):
+        """Endless mode - the circuit carries on east one chunk at a time"""
+        self.puzzle_index += 1
+        self.app.tasks.cancel(self.task_key("test"))
+        self.app.tasks.cancel(self.task_key("generate"))
+        seed = circuit_logic.puzzle_rng(self.puzzle_seed, self.puzzle_index).getrandbits(64)
+        self.endless = endless_mode.ChunkedBoard(seed, self.size)
+        self.show_chunk()
+        self.status_label.config(text="Endless mode - carry the circuit on from chunk to chunk",
+                                 fg='#00ff88')
+
+    def start_bandwidth(self, ports=3):
+        """Bandwidth mode - score as many separate routes between the ports as possible"""
+        self.ports = max_flow.port_rows(self.size, ports)
+        self.generate_puzzle()
+        self.status_label.config(text="Bandwidth mode - connect every IN port to an OUT port",
+                                 fg='#00ff88')
+
+    def show_chunk(self):
+        """Show the endless chunk the player has got to"""
+        k = self.endless.current
+        self.load_puzzle(self.endless.chunk(k), self.endless.seam_row(k),
+                         self.endless.seam_row(k + 1), ("endless", self.endless.seed, k))
+
+    def load_puzzle(self, puzzle, entry_row=None, exit_row=None, puzzle_id=None):
+        """Show a freshly generated (board, rotations)"""
+        # A test queued while this board was on its way is for the old one
+        self.app.tasks.cancel(self.task_key("test"))
+        self.board, self.rotations = puzzle
+        self.puzzle_id = puzzle_id
+        self.solved = False
+        self.entry_row = self.size // 2 if entry_row is None else entry_row
+        self.exit_row = self.size // 2 if exit_row is None else exit_row
+        self.powered = circuit_logic.PoweredRegion(self.board, self.rotations,
+                                                   self.ports or (self.entry_row,))
+        self.rotator.cancel_all()
+        self.board_hash = board_cache.hasher_for(self.size, self.size).hash_board(
+            self.board, self.rotations)
+
+        self.packet_pos = None
+        self.renderer.mark_all_dirty()
+
+        self.clicks = 0
+        self.par = None
+        if self.ports:
+            self.bandwidth = max_flow.BandwidthScore(self.board, self.rotations,
+                                                     self.ports, self.ports)
+            self.update_score()
+        else:
+            self.compute_par()
+
+    def compute_par(self):
+        """Work out par for the board as dealt"""
+        key = board_cache.cache_key(("par", self.entry_row, self.exit_row),
+                                    self.board, self.board_hash)
+        par = board_cache.BOARD_CACHE.get(key, board_cache.MISSING)
+        if par is not board_cache.MISSING:
+            self.show_par(par)
+            return
+        self.update_score()
+        board = [row[:] for row in self.board]
+        rotations = [row[:] for row in self.rotations]
+        self.app.tasks.submit(self.task_key("par"), par_solver.par,
+                              (board, rotations, self.entry_row, self.exit_row),
+                              on_done=lambda par: self.finish_par(key, par))
+
+    def finish_par(self, key, par):
+        """Remember a worker's par and show it"""
+        board_cache.BOARD_CACHE.put(key, par)
+        self.show_par(par)
+
+    def show_par(self, par):
+        self.par = par
+        self.update_score()
+
+    def update_score(self):
+        """Show clicks so far against par (or the bandwidth)"""
+        if self.bandwidth is not None:
+            self.score_label.config(text=f"Clicks: {self.clicks}   Bandwidth: "
+                                         f"{self.bandwidth.routes}/{self.bandwidth.most} routes")
+            return
+        par = "..." if self.par is None else self.par
+        self.score_label.config(text=f"Clicks: {self.clicks}   Par: {par}")
+
+    def record_attempt(self):
+        """Keep the clicks (and par) a solved board took, once per board"""
+        if not self.solved:
+            self.solved = True
+            self.attempts.append((self.puzzle_id, self.clicks, self.par))
+        if self.par is None:
+            return f"{self.clicks} clicks"
+        return f"{self.clicks} clicks, par {self.par}"
+
+    def draw_rounded_rect(self, x1, y1, x2, y2, radius=10, **kwargs):
+        """Draw a rounded rectangle on the canvas"""
+        points = []
+        for x, y in [(x1, y1 + radius), (x1, y1), (x1 + radius, y1),
+                     (x2 - radius, y1), (x2, y1), (x2, y1 + radius),
+                     (x2, y2 - radius), (x2, y2), (x2 - radius, y2),
+                     (x1 + radius, y2), (x1, y2), (x1, y2 - radius)]:
+            points.extend([x, y])
+        return self.canvas.create_polygon(points, smooth=True, **kwargs)
+
+    def get_rotated_connections(self, piece_type, rotation):
+        """Get the connections for a piece after rotation"""
+        return circuit_logic.rotated_connections(piece_type, rotation)
+
+    def draw_circuit_piece(self, x, y, piece_type, rotation, highlight=False, tags=()):
+        """Draw a circuit piece with connections"""
+        center_x = x + self.block_size // 2
+        center_y = y + self.block_size // 2
+
+        # Draw block background
+        block_color = '#95a5a6' if not highlight else '#b8c5c8'
+        self.draw_rounded_rect(x, y, x + self.block_size, y + self.block_size,
+                              radius=12, fill=block_color, outline='#7f8c8d', width=2,
+                              tags=tags)
+
+        # Get rotated connections
+        connections = self.get_rotated_connections(piece_type, rotation)
+
+        # Draw connection lines
+        line_width = 4
+        connection_color = '#2c3e50'
+
+        # Connection points (North, East, South, West)
+        points = [
+            (center_x, y + 10),           # North
+            (x + self.block_size - 10, center_y),  # East
+            (center_x, y + self.block_size - 10),  # South
+            (x + 10, center_y)            # West
+        ]
+
+        # Draw connections based on piece type
+        if piece_type == 'straight_h':
+            if connections[1] and connections[3]:  # East-West
+                self.canvas.create_line(points[3][0], points[3][1],
+                                      points[1][0], points[1][1],
+                                      width=line_width, fill=connection_color, tags=tags)
+        elif piece_type == 'straight_v':
+            if connections[0] and connections[2]:  # North-South
+                self.canvas.create_line(points[0][0], points[0][1],
+                                      points[2][0], points[2][1],
+                                      width=line_width, fill=connection_color, tags=tags)
+        elif 'corner' in piece_type:
+            # Draw corner connections
+            active_dirs = [i for i, conn in enumerate(connections) if conn]
+            if len(active_dirs) == 2:
+                # Draw lines from center to each active direction
+                for direction in active_dirs:
+                    self.canvas.create_line(center_x, center_y,
+                                          points[direction][0], points[direction][1],
+                                          width=line_width, fill=connection_color, tags=tags)
+        elif piece_type == 'cross':
+            # Draw cross (all four directions)
+            for i, conn in enumerate(connections):
+                if conn:
+                    self.canvas.create_line(center_x, center_y,
+                                          points[i][0], points[i][1],
+                                          width=line_width, fill=connection_color, tags=tags)
+        elif 't_shape' in piece_type:
+            # Draw T-shape connections
+            for i, conn in enumerate(connections):
+                if conn:
+                    self.canvas.create_line(center_x, center_y,
+                                          points[i][0], points[i][1],
+                                          width=line_width, fill=connection_color, tags=tags)
+
+        # Draw center dot
+        self.canvas.create_oval(center_x - 3, center_y - 3,
+                               center_x + 3, center_y + 3,
+                               fill=connection_color, outline=connection_color, tags=tags)
+
+    def update_display(self):
+        """Update the visual display of the puzzle"""
+        self.canvas.delete("all")
+
+        for i in range(self.size):
+            for j in range(self.size):
+                x1 = j * (self.block_size + self.gap)
+                y1 = i * (self.block_size + self.gap)
+
+                piece_type = self.board[i][j]
+                rotation = self.rotations[i][j]
+
+                self.draw_circuit_piece(x1, y1, piece_type, rotation,
+                                        highlight=(i, j) in self.powered.cells,
+                                        tags=(f"cell_{i}_{j}",))
+
+        # Draw entry and exit indicators
+        for entry_row in self.ports or (self.entry_row,):
+            entry_y = entry_row * (self.block_size + self.gap) + self.block_size // 2
+            self.canvas.create_text(-15, entry_y, text="IN",
+                                   font=("Arial", 12, "bold"), fill='#00ff88')
+
+        canvas_width = self.size * (self.block_size + self.gap) - self.gap
+        for exit_row in self.ports or (self.exit_row,):
+            exit_y = exit_row * (self.block_size + self.gap) + self.block_size // 2
+            self.canvas.create_text(canvas_width + 15, exit_y, text="OUT",
+                                   font=("Arial", 12, "bold"), fill='#ff6666')
+
+    def cell_origin(self, row, col):
+        """Top-left canvas position of a block"""
+        return col * (self.block_size + self.gap), row * (self.block_size + self.gap)
+
+    def redraw_cell(self, row, col):
+        """Redraw a single block in place"""
+        tag = f"cell_{row}_{col}"
+        self.canvas.delete(tag)
+        x1 = col * (self.block_size + self.gap)
+        y1 = row * (self.block_size + self.gap)
+        self.draw_circuit_piece(x1, y1, self.board[row][col], self.rotations[row][col],
+                                highlight=(row, col) in self.powered.cells,
+                                tags=(tag,))
+
+    def redraw_packet(self):
+        """Redraw the data packet on top of the board"""
+        self.canvas.delete("packet")
+        if self.packet_pos is None:
+            return
+        row, col = self.packet_pos
+        x = col * (self.block_size + self.gap) + self.block_size // 2
+        y = row * (self.block_size + self.gap) + self.block_size // 2
+        self.canvas.create_oval(x - 8, y - 8, x + 8, y + 8,
+                                fill='#00ff88', outline='#ffffff', width=2,
+                                tags=("packet",))
+
+    def flush_redraw(self, dirty, full):
+        """Render callback for the scheduler - draws everything dirty this frame"""
+        if full:
+            self.update_display()
+        else:
+            for key in dirty:
+                if key != "packet":
+                    self.redraw_cell(*key)
+        if full or dirty:
+            # Turning blocks stay on top of their redrawn cells
+            self.canvas.tag_raise("anim")
+            self.redraw_packet()
+
+    def on_right_click(self, event):
+        """Handle right clicks to rotate pieces"""
+        col = event.x // (self.block_size + self.gap)
+        row = event.y // (self.block_size + self.gap)
+
+        if self.board and 0 <= row < self.size and 0 <= col < self.size:
+            # The board changed, so a test in flight is stale
+            self.app.tasks.cancel(self.task_key("test"))
+            # Rotate the piece 90 degrees clockwise
+            old_rotation = self.rotations[row][col]
+            self.rotations[row][col] = (old_rotation + 1) % 4
+            self.board_hash = board_cache.hasher_for(self.size, self.size).rotate(
+                self.board_hash, row, col, self.board[row][col],
+                old_rotation, self.rotations[row][col])
+            # The block is redrawn in its final state underneath the animation
+            self.renderer.mark_dirty((row, col))
+            # Only blocks that gained or lost power need redrawing
+            for cell in self.powered.rotated(row, col):
+                self.renderer.mark_dirty(cell)
+            self.rotator.rotate(row, col, self.board[row][col], old_rotation,
+                                highlight=(row, col) in self.powered.cells)
+            self.status_label.config(text=f"Rotated piece at ({row+1}, {col+1})")
+            self.clicks += 1
+            if self.bandwidth is not None:
+                self.bandwidth.rotated(row, col)
+                if self.bandwidth.routes == self.bandwidth.most:
+                    self.status_label.config(text="Full bandwidth! Every port is connected",
+                                             fg='#00ff88')
+            self.update_score()
+
+            if self.endless is not None and self.endless.power_changed(self.powered.cells):
+                score = self.record_attempt()
+                self.show_chunk()
+                self.status_label.config(text=f"Chunk {self.endless.current} connected in {score}! "
+                                              f"On to chunk {self.endless.current + 1}",
+                                         fg='#00ff88')
+
+    def on_left_click(self, event):
+        """Handle left clicks for selection (future feature)"""
+        pass
+
+    def find_path(self):
+        """Find if there's a complete path from left entry to right exit"""
+        return circuit_logic.find_path(self.board, self.rotations)
+
+    def test_circuit(self):
+        """Test if the circuit is complete and animate data flow"""
+        if not self.board or self.app.tasks.busy(self.task_key("generate")):
+            return  # Nothing to test yet, or the board is about to be replaced
+        if self.endless is not None:
+            # Endless chunks connect as soon as power crosses the seam
+            reach = max((col + 1 for _, col in self.powered.cells), default=0)
+            self.status_label.config(text=f"Power reaches {reach} of {self.size} columns "
+                                          f"in chunk {self.endless.current + 1}", fg='#888888')
+            return
+        if self.bandwidth is not None:
+            # Bandwidth is scored live, there is no single route to test
+            self.status_label.config(text=f"{self.bandwidth.routes} separate routes of "
+                                          f"{self.bandwidth.most} possible", fg='#888888')
+            return
+        # Toggling a block back and forth revisits states we've already tested
+        key = board_cache.cache_key("path", self.board, self.board_hash)
+        path = board_cache.BOARD_CACHE.get(key, board_cache.MISSING)
+        if path is not board_cache.MISSING:
+            self.show_test_result(path)
+            return
+        self.status_label.config(text="Testing circuit...", fg='#888888')
+        # Work on a snapshot, the player may keep rotating while it runs
+        board = [row[:] for row in self.board]
+        rotations = [row[:] for row in self.rotations]
+        self.app.tasks.submit(self.task_key("test"), circuit_logic.find_path, (board, rotations),
+                              on_done=lambda path: self.finish_test(key, path))
+
+    def finish_test(self, key, path):
+        """Remember a worker's test result and show it"""
+        board_cache.BOARD_CACHE.put(key, path)
+        self.show_test_result(path)
+
+    def show_test_result(self, path):
+        """Report the result of a circuit test"""
+        if path:
+            score = self.record_attempt()
+            self.status_label.config(text=f"Circuit complete in {score}! Data flowing...",
+                                     fg='#00ff88')
+            self.animate_data_packet(path)
+        else:
+            metrics.FAILED_TESTS.inc()
+            self.status_label.config(text="Circuit incomplete! Rotate pieces to connect.", fg='#ff6666')
+            messagebox.showinfo("Circuit Test", "Circuit is not complete!\nRotate pieces to create a path from IN to OUT.",
+                                parent=self.parent)
+
+    def animate_data_packet(self, path):
+        """Animate a data packet traveling through the circuit"""
+        self.cancel_animation()
+
+        self.packet_path = path
+        self.packet_index = 0
+        self.draw_packet()
+
+    def draw_packet(self):
+        """Move the data packet to its next position"""
+        if self.packet_index < len(self.packet_path):
+            self.packet_pos = self.packet_path[self.packet_index]
+            self.renderer.mark_dirty("packet")
+
+            self.packet_index += 1
+            self.schedule_animation(300, self.draw_packet)
+        else:
+            # Animation complete
+            self.status_label.config(text="Data packet delivered successfully!", fg='#00ff88')
+            self.schedule_animation(1000, self.clear_packet)
+
+    def clear_packet(self):
+        """Remove the data packet from the board"""
+        self.animation_id = None
+        self.animation_callback = None
+        self.packet_pos = None
+        self.renderer.mark_dirty("packet")
+
+    def schedule_animation(self, delay_ms, callback):
+        """Run the next animation step later (held back while idle)"""
+        self.animation_callback = callback
+        self.animation_due = time.monotonic() + delay_ms / 1000.0
+        if self.app.idle.idle:
+            self.animation_paused = (callback, delay_ms)
+            return
+        self.animation_id = self.root.after(delay_ms, callback)
+
+    def cancel_animation(self):
+        """Drop any pending animation step"""
+        if self.animation_id:
+            self.root.after_cancel(self.animation_id)
+        self.animation_id = None
+        self.animation_callback = None
+        self.animation_paused = None
+
+    def suspend_animation(self):
+        """Hold the packet animation where it is"""
+        if self.animation_id:
+            self.root.after_cancel(self.animation_id)
+            self.animation_id = None
+            left = max(0, int((self.animation_due - time.monotonic()) * 1000))
+            self.animation_paused = (self.animation_callback, left)
+
+    def resume_animation(self):
+        """Carry on with a held packet animation"""
+        if self.animation_paused is not None:
+            callback, left = self.animation_paused
+            self.animation_paused = None
+            self.schedule_animation(left, callback)
+
+    def destroy(self):
+        """Stop everything this session has scheduled and remove its widgets"""
+        self.app.tasks.cancel(self.task_key("test"))
+        self.app.tasks.cancel(self.task_key("generate"))
+        self.app.tasks.cancel(self.task_key("par"))
+        self.renderer.cancel()
+        self.cancel_animation()
+        self.rotator.cancel_all()
+        if self.window is not None:
+            self.window.destroy()
+
+
 class DataConnectorGame:
-    def __init__(self):
+    """The application - one Tk root shared by any number of game sessions"""
+
+    def __init__(self, sessions=1):
+        _load_tk()
         self.root = tk.Tk()
         self.root.title("Data Connector")
         self.root.geometry("520x580")
@@ -13,11 +636,17 @@ class DataConnectorGame:
         
         # Game states
         self.current_state = "title"  # "title" or "game"
+        self.session_count = sessions
+        self.sessions = []
         
         # Music settings
         self.music_enabled = True
         self.current_music_thread = None
         self.music_stop_flag = False
+        # Cleared while the game is idle - the music thread blocks on it
+        self.music_resume = threading.Event()
+        self.music_resume.set()
+        self.music_suspended = False
         
         # Game settings
         self.size = 6
@@ -25,27 +654,21 @@ class DataConnectorGame:
         self.gap = 5
         
         # Circuit piece types (connections in 4 directions: North, East, South, West)
-        self.piece_types = {
-            'straight_h': [False, True, False, True],    # Horizontal line
-            'straight_v': [True, False, True, False],    # Vertical line
-            'corner_ne': [True, True, False, False],     # Corner North-East
-            'corner_se': [False, True, True, False],     # Corner South-East
-            'corner_sw': [False, False, True, True],     # Corner South-West
-            'corner_nw': [True, False, False, True],     # Corner North-West
-            'cross': [True, True, True, True],           # Cross (all directions)
-            't_shape_n': [True, True, False, True],      # T-shape with top
-            't_shape_e': [True, True, True, False],      # T-shape with right
-            't_shape_s': [False, True, True, True],      # T-shape with bottom
-            't_shape_w': [True, False, True, True],      # T-shape with left
-        }
+        self.piece_types = circuit_logic.PIECE_TYPES
         
-        # Initialize game variables
-        self.board = []
-        self.rotations = []
-        self.packet_pos = None
-        self.packet_path = []
-        self.animation_id = None
-        self.packet_index = 0
+        # Shared by every session: rotation frames are only rasterised once
+        self.rotation_frames = RotationFrames(self.root, self.block_size)
+
+        # Heavy board logic runs in a worker so the window stays responsive
+        self.tasks = TaskExecutor(self.root)
+
+        # Stop every periodic wakeup while the window is hidden or unused
+        self.idle = IdleManager(self.root, self.suspend_activity, self.resume_activity)
+
+        # Sampling profiler for lag reports, idle until Ctrl+Shift+P (or --profile)
+        self.profiler = SamplingProfiler({"tk-main": threading.main_thread,
+                                          "music": lambda: self.current_music_thread})
+        self.root.bind_all("<Control-Shift-KeyPress-P>", self.toggle_profiler, add="+")
         
         self.show_title_screen()
         
@@ -98,6 +721,34 @@ class DataConnectorGame:
                              relief='raised', bd=4)
         start_btn.pack(pady=10)
         
+        # Daily challenge - only offered when a calendar has been built
+        if os.path.exists(daily_challenge.DEFAULT_CALENDAR):
+            daily_btn = tk.Button(button_frame, text="DAILY CHALLENGE",
+                                 command=lambda: self.start_game("daily"),
+                                 font=("Arial", 12, "bold"),
+                                 bg='#ffffff', fg='#ff0000',
+                                 padx=20, pady=5,
+                                 relief='raised', bd=3)
+            daily_btn.pack(pady=5)
+
+        # Endless mode
+        endless_btn = tk.Button(button_frame, text="ENDLESS MODE",
+                               command=lambda: self.start_game("endless"),
+                               font=("Arial", 12, "bold"),
+                               bg='#ffffff', fg='#ff0000',
+                               padx=20, pady=5,
+                               relief='raised', bd=3)
+        endless_btn.pack(pady=5)
+
+        # Bandwidth mode
+        bandwidth_btn = tk.Button(button_frame, text="BANDWIDTH MODE",
+                                 command=lambda: self.start_game("bandwidth"),
+                                 font=("Arial", 12, "bold"),
+                                 bg='#ffffff', fg='#ff0000',
+                                 padx=20, pady=5,
+                                 relief='raised', bd=3)
+        bandwidth_btn.pack(pady=5)
+
         # Music toggle button
         music_text = "MUSIC: ON" if self.music_enabled else "MUSIC: OFF"
         self.music_btn = tk.Button(button_frame, text=music_text, 
@@ -116,19 +767,57 @@ class DataConnectorGame:
                                justify='center')
         instructions.pack(pady=20)
         
-    def start_game(self):
-        """Start the main game"""
+    def start_game(self, mode="classic"):
+        """Start the main game (plus any extra session windows)
+
+        mode is "classic", "daily", "endless" or "bandwidth".
+        """
         self.current_state = "game"
         self.stop_music()
         self.clear_screen()
         self.root.configure(bg='#1a1a2e')
-        self.create_game_widgets()
-        self.generate_puzzle()
-        self.update_display()
+        self.open_session(mode, in_root=True)
+        for _ in range(self.session_count - 1):
+            self.open_session(mode)
         self.play_game_music()
         
+    def open_session(self, mode="classic", in_root=False):
+        """Start a game session in the main window or in a new Toplevel"""
+        if in_root:
+            session = GameSession(self, self.root)
+        else:
+            window = tk.Toplevel(self.root)
+            window.title(f"Data Connector - session {len(self.sessions) + 1}")
+            window.geometry("520x580")
+            window.configure(bg='#1a1a2e')
+            session = GameSession(self, window, window)
+            window.protocol("WM_DELETE_WINDOW", lambda: self.close_session(session))
+            # Minimising the main window mustn't idle a session still on screen
+            self.idle.watch(window)
+        self.sessions.append(session)
+        if mode == "endless":
+            session.start_endless()
+        elif mode == "bandwidth":
+            session.start_bandwidth()
+        elif mode == "daily":
+            session.load_daily_puzzle()
+        else:
+            session.generate_puzzle()
+        return session
+
+    def close_session(self, session):
+        """Shut one session down"""
+        if session in self.sessions:
+            self.sessions.remove(session)
+            if session.window is not None:
+                self.idle.unwatch(session.window)
+            session.destroy()
+
     def clear_screen(self):
-        """Clear all widgets from the screen"""
+        """Clear all widgets from the screen (ends every session)"""
+        for session in list(self.sessions):
+            self.close_session(session)
+        self.tasks.cancel_all()
         for widget in self.root.winfo_children():
             widget.destroy()
             
@@ -137,8 +826,10 @@ class DataConnectorGame:
         self.music_enabled = not self.music_enabled
         music_text = "MUSIC: ON" if self.music_enabled else "MUSIC: OFF"
         
-        if hasattr(self, 'music_btn'):
+        if self.current_state == "title":
             self.music_btn.config(text=music_text)
+        for session in self.sessions:
+            session.update_music_button()
             
         if not self.music_enabled:
             self.stop_music()
@@ -158,6 +849,7 @@ class DataConnectorGame:
         self.current_music_thread = threading.Thread(target=self._title_music_loop)
         self.current_music_thread.daemon = True
         self.current_music_thread.start()
+        metrics.MUSIC_RESTARTS.inc()
         
     def play_game_music(self):
         """Play in-game music (simulated with beeps)"""
@@ -169,12 +861,22 @@ class DataConnectorGame:
         self.current_music_thread = threading.Thread(target=self._game_music_loop)
         self.current_music_thread.daemon = True
         self.current_music_thread.start()
+        metrics.MUSIC_RESTARTS.inc()
         
     def stop_music(self):
         """Stop current music"""
         self.music_stop_flag = True
+        self.music_resume.set()  # Let a suspended thread see the stop flag
         if self.current_music_thread and self.current_music_thread.is_alive():
             self.current_music_thread.join(timeout=0.1)
+        if self.music_suspended:
+            self.music_resume.clear()
+
+    def _music_sleep(self, seconds):
+        """Wait between notes, holding (with no wakeups) while music is suspended"""
+        time.sleep(seconds)
+        while not self.music_resume.is_set() and not self.music_stop_flag:
+            self.music_resume.wait()
             
     def _title_music_loop(self):
         """Title screen music loop - heroic/epic theme"""
@@ -189,10 +891,10 @@ class DataConnectorGame:
                 try:
                     # Use a simple tone generation (cross-platform compatible)
                     self.root.bell()  # System bell as fallback
-                    time.sleep(note_duration)
+                    self._music_sleep(note_duration)
                 except:
-                    time.sleep(note_duration)
-            time.sleep(1.0)  # Pause between loops
+                    self._music_sleep(note_duration)
+            self._music_sleep(1.0)  # Pause between loops
             
     def _game_music_loop(self):
         """Game music loop - electronic/tech theme"""
@@ -206,344 +908,43 @@ class DataConnectorGame:
                     return
                 try:
                     self.root.bell()  # System bell as fallback
-                    time.sleep(note_duration)
+                    self._music_sleep(note_duration)
                 except:
-                    time.sleep(note_duration)
-            time.sleep(0.8)  # Shorter pause for more electronic feel
-        
-    def create_game_widgets(self):
-        """Create the game interface widgets"""
-        # Back to title button
-        back_btn = tk.Button(self.root, text="← TITLE", 
-                            command=self.show_title_screen,
-                            font=("Arial", 10, "bold"),
-                            bg='#666666', fg='white',
-                            padx=10, pady=2)
-        back_btn.place(x=10, y=10)
-        
-        # Title
-        title = tk.Label(self.root, text="DATA CONNECTOR", 
-                        font=("Impact", 18, "bold"), 
-                        bg='#1a1a2e', fg='#00ff88')
-        title.pack(pady=10)
-        
-        # Instructions
-        instructions = tk.Label(self.root, 
-                               text="Right-click blocks to rotate • Connect left to right for data flow", 
-                               font=("Arial", 10), 
-                               bg='#1a1a2e', fg='#888888')
-        instructions.pack(pady=5)
-        
-        # Game frame
-        self.game_frame = tk.Frame(self.root, bg='#16213e', bd=2, relief='raised')
-        self.game_frame.pack(padx=20, pady=10)
-        
-        # Create canvas for the puzzle
-        canvas_size = self.size * (self.block_size + self.gap) - self.gap
-        self.canvas = tk.Canvas(self.game_frame, 
-                               width=canvas_size, 
-                               height=canvas_size,
-                               bg='#16213e', highlightthickness=0)
-        self.canvas.pack(padx=10, pady=10)
-        
-        # Bind events
-        self.canvas.bind("<Button-3>", self.on_right_click)  # Right click to rotate
-        self.canvas.bind("<Button-1>", self.on_left_click)   # Left click for selection
-        
-        # Control buttons
-        button_frame = tk.Frame(self.root, bg='#1a1a2e')
-        button_frame.pack(pady=10)
-        
-        test_btn = tk.Button(button_frame, text="Test Circuit", 
-                            command=self.test_circuit,
-                            font=("Arial", 12, "bold"),
-                            bg='#0066cc', fg='white',
-                            padx=20, pady=5)
-        test_btn.pack(side=tk.LEFT, padx=5)
-        
-        new_btn = tk.Button(button_frame, text="New Puzzle", 
-                           command=self.generate_puzzle,
-                           font=("Arial", 12, "bold"),
-                           bg='#cc6600', fg='white',
-                           padx=20, pady=5)
-        new_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Music toggle in game
-        music_text = "♪ ON" if self.music_enabled else "♪ OFF"
-        music_btn = tk.Button(button_frame, text=music_text, 
-                             command=self.toggle_music,
-                             font=("Arial", 10, "bold"),
-                             bg='#444444', fg='white',
-                             padx=15, pady=5)
-        music_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Status label
-        self.status_label = tk.Label(self.root, text="Right-click blocks to rotate them", 
-                                    font=("Arial", 11), 
-                                    bg='#1a1a2e', fg='#00ff88')
-        self.status_label.pack(pady=5)
-        
-    def generate_puzzle(self):
-        """Generate a new puzzle with random pieces"""
-        self.board = []
-        self.rotations = []
-        
-        piece_names = list(self.piece_types.keys())
-        
-        for i in range(self.size):
-            row = []
-            rot_row = []
-            for j in range(self.size):
-                # Choose random piece type
-                piece_type = random.choice(piece_names)
-                row.append(piece_type)
-                # Random initial rotation
-                rot_row.append(random.randint(0, 3))
-            self.board.append(row)
-            self.rotations.append(rot_row)
-        
-        # Ensure there are entry and exit points
-        # Left side entry (middle row)
-        entry_row = self.size // 2
-        self.board[entry_row][0] = 'straight_h'
-        self.rotations[entry_row][0] = 0
-        
-        # Right side exit (middle row)
-        exit_row = self.size // 2
-        self.board[exit_row][self.size-1] = 'straight_h'
-        self.rotations[exit_row][self.size-1] = 0
-        
-        if hasattr(self, 'canvas'):
-            self.update_display()
-        
-    def draw_rounded_rect(self, x1, y1, x2, y2, radius=10, **kwargs):
-        """Draw a rounded rectangle on the canvas"""
-        points = []
-        for x, y in [(x1, y1 + radius), (x1, y1), (x1 + radius, y1),
-                     (x2 - radius, y1), (x2, y1), (x2, y1 + radius),
-                     (x2, y2 - radius), (x2, y2), (x2 - radius, y2),
-                     (x1 + radius, y2), (x1, y2), (x1, y2 - radius)]:
-            points.extend([x, y])
-        return self.canvas.create_polygon(points, smooth=True, **kwargs)
-    
-    def get_rotated_connections(self, piece_type, rotation):
-        """Get the connections for a piece after rotation"""
-        connections = self.piece_types[piece_type].copy()
-        # Rotate connections (each rotation is 90 degrees clockwise)
-        for _ in range(rotation):
-            connections = [connections[3]] + connections[:-1]
-        return connections
-    
-    def draw_circuit_piece(self, x, y, piece_type, rotation, highlight=False):
-        """Draw a circuit piece with connections"""
-        center_x = x + self.block_size // 2
-        center_y = y + self.block_size // 2
-        
-        # Draw block background
-        block_color = '#95a5a6' if not highlight else '#b8c5c8'
-        self.draw_rounded_rect(x, y, x + self.block_size, y + self.block_size, 
-                              radius=12, fill=block_color, outline='#7f8c8d', width=2)
-        
-        # Get rotated connections
-        connections = self.get_rotated_connections(piece_type, rotation)
-        
-        # Draw connection lines
-        line_width = 4
-        connection_color = '#2c3e50'
-        
-        # Connection points (North, East, South, West)
-        points = [
-            (center_x, y + 10),           # North
-            (x + self.block_size - 10, center_y),  # East
-            (center_x, y + self.block_size - 10),  # South
-            (x + 10, center_y)            # West
-        ]
-        
-        # Draw connections based on piece type
-        if piece_type == 'straight_h':
-            if connections[1] and connections[3]:  # East-West
-                self.canvas.create_line(points[3][0], points[3][1], 
-                                      points[1][0], points[1][1], 
-                                      width=line_width, fill=connection_color)
-        elif piece_type == 'straight_v':
-            if connections[0] and connections[2]:  # North-South
-                self.canvas.create_line(points[0][0], points[0][1], 
-                                      points[2][0], points[2][1], 
-                                      width=line_width, fill=connection_color)
-        elif 'corner' in piece_type:
-            # Draw corner connections
-            active_dirs = [i for i, conn in enumerate(connections) if conn]
-            if len(active_dirs) == 2:
-                # Draw lines from center to each active direction
-                for direction in active_dirs:
-                    self.canvas.create_line(center_x, center_y, 
-                                          points[direction][0], points[direction][1], 
-                                          width=line_width, fill=connection_color)
-        elif piece_type == 'cross':
-            # Draw cross (all four directions)
-            for i, conn in enumerate(connections):
-                if conn:
-                    self.canvas.create_line(center_x, center_y, 
-                                          points[i][0], points[i][1], 
-                                          width=line_width, fill=connection_color)
-        elif 't_shape' in piece_type:
-            # Draw T-shape connections
-            for i, conn in enumerate(connections):
-                if conn:
-                    self.canvas.create_line(center_x, center_y, 
-                                          points[i][0], points[i][1], 
-                                          width=line_width, fill=connection_color)
-        
-        # Draw center dot
-        self.canvas.create_oval(center_x - 3, center_y - 3, 
-                               center_x + 3, center_y + 3, 
-                               fill=connection_color, outline=connection_color)
-    
-    def update_display(self):
-        """Update the visual display of the puzzle"""
-        if not hasattr(self, 'canvas'):
-            return
-            
-        self.canvas.delete("all")
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                x1 = j * (self.block_size + self.gap)
-                y1 = i * (self.block_size + self.gap)
-                
-                piece_type = self.board[i][j]
-                rotation = self.rotations[i][j]
-                
-                self.draw_circuit_piece(x1, y1, piece_type, rotation)
-        
-        # Draw entry and exit indicators
-        entry_y = (self.size // 2) * (self.block_size + self.gap) + self.block_size // 2
-        self.canvas.create_text(-15, entry_y, text="IN", 
-                               font=("Arial", 12, "bold"), fill='#00ff88')
-        
-        canvas_width = self.size * (self.block_size + self.gap) - self.gap
-        exit_y = (self.size // 2) * (self.block_size + self.gap) + self.block_size // 2
-        self.canvas.create_text(canvas_width + 15, exit_y, text="OUT", 
-                               font=("Arial", 12, "bold"), fill='#ff6666')
-    
-    def on_right_click(self, event):
-        """Handle right clicks to rotate pieces"""
-        col = event.x // (self.block_size + self.gap)
-        row = event.y // (self.block_size + self.gap)
-        
-        if 0 <= row < self.size and 0 <= col < self.size:
-            # Rotate the piece 90 degrees clockwise
-            self.rotations[row][col] = (self.rotations[row][col] + 1) % 4
-            self.update_display()
-            if hasattr(self, 'status_label'):
-                self.status_label.config(text=f"Rotated piece at ({row+1}, {col+1})")
-    
-    def on_left_click(self, event):
-        """Handle left clicks for selection (future feature)"""
-        pass
-    
-    def find_path(self):
-        """Find if there's a complete path from left entry to right exit"""
-        entry_row = self.size // 2
-        entry_col = 0
-        exit_row = self.size // 2
-        exit_col = self.size - 1
-        
-        # BFS to find path
-        from collections import deque
-        queue = deque([(entry_row, entry_col, 1)])  # Start moving east from entry
-        visited = set()
-        path = {}
-        
-        directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]  # N, E, S, W
-        
-        while queue:
-            row, col, from_dir = queue.popleft()
-            
-            if (row, col, from_dir) in visited:
-                continue
-            visited.add((row, col, from_dir))
-            
-            if row == exit_row and col == exit_col:
-                # Found path to exit, reconstruct it
-                result_path = []
-                current = (row, col)
-                while current in path:
-                    result_path.append(current)
-                    current = path[current]
-                result_path.append((entry_row, entry_col))
-                return list(reversed(result_path))
-            
-            # Check if current piece accepts connection from the direction we came from
-            piece_type = self.board[row][col]
-            rotation = self.rotations[row][col]
-            connections = self.get_rotated_connections(piece_type, rotation)
-            
-            # Direction we came from (opposite of from_dir)
-            came_from_dir = (from_dir + 2) % 4
-            
-            if not connections[came_from_dir]:
-                continue  # This piece doesn't accept connection from where we came
-            
-            # Try all possible exits from this piece
-            for exit_dir in range(4):
-                if exit_dir != came_from_dir and connections[exit_dir]:
-                    # Can exit in this direction
-                    dr, dc = directions[exit_dir]
-                    new_row, new_col = row + dr, col + dc
-                    
-                    if 0 <= new_row < self.size and 0 <= new_col < self.size:
-                        if (new_row, new_col) not in path:
-                            path[(new_row, new_col)] = (row, col)
-                        queue.append((new_row, new_col, exit_dir))
-        
-        return None  # No path found
-    
-    def test_circuit(self):
-        """Test if the circuit is complete and animate data flow"""
-        path = self.find_path()
-        
-        if path:
-            if hasattr(self, 'status_label'):
-                self.status_label.config(text="Circuit complete! Data flowing...", fg='#00ff88')
-            self.animate_data_packet(path)
+                    self._music_sleep(note_duration)
+            self._music_sleep(0.8)  # Shorter pause for more electronic feel
+        
+    def suspend_activity(self):
+        """Window hidden or unused - stop music, animation and polling wakeups"""
+        self.music_suspended = True
+        self.music_resume.clear()
+        for session in self.sessions:
+            session.suspend_animation()
+        self.tasks.suspend()
+        
+    def resume_activity(self):
+        """Pick everything up again where it stopped"""
+        self.music_suspended = False
+        self.music_resume.set()
+        for session in self.sessions:
+            session.resume_animation()
+        self.tasks.resume()
+        
+    def toggle_profiler(self, event=None):
+        """Start or stop a profile capture (hidden hotkey)"""
+        if self.profiler.running:
+            self.profiler.stop()
+            print(f"Profile written to {self.profiler.path}")
         else:
-            if hasattr(self, 'status_label'):
-                self.status_label.config(text="Circuit incomplete! Rotate pieces to connect.", fg='#ff6666')
-            messagebox.showinfo("Circuit Test", "Circuit is not complete!\nRotate pieces to create a path from IN to OUT.")
-    
-    def animate_data_packet(self, path):
-        """Animate a data packet traveling through the circuit"""
-        if self.animation_id:
-            self.root.after_cancel(self.animation_id)
-        
-        self.packet_path = path
-        self.packet_index = 0
-        self.draw_packet()
-    
-    def draw_packet(self):
-        """Draw the data packet at current position"""
-        if self.packet_index < len(self.packet_path):
-            # Remove previous packet
-            if hasattr(self, 'packet_id'):
-                self.canvas.delete(self.packet_id)
-            
-            # Draw packet at current position
-            row, col = self.packet_path[self.packet_index]
-            x = col * (self.block_size + self.gap) + self.block_size // 2
-            y = row * (self.block_size + self.gap) + self.block_size // 2
-            
-            self.packet_id = self.canvas.create_oval(x - 8, y - 8, x + 8, y + 8,
-                                                    fill='#00ff88', outline='#ffffff', width=2)
-            
-            self.packet_index += 1
-            self.animation_id = self.root.after(300, self.draw_packet)
-        else:
-            # Animation complete
-            if hasattr(self, 'status_label'):
-                self.status_label.config(text="Data packet delivered successfully!", fg='#00ff88')
-            if hasattr(self, 'packet_id'):
-                self.root.after(1000, lambda: self.canvas.delete(self.packet_id))
+            self.start_profiler()
+        
+    def start_profiler(self, seconds=None, path=None):
+        """Profile the Tk and music threads for up to `seconds`, written as collapsed stacks"""
+        if path is None:
+            path = os.path.join(PROFILE_DIR, time.strftime("profile-%Y%m%d-%H%M%S.folded"))
+        if seconds is None:
+            seconds = self.profiler.duration
+        if self.profiler.start(path, seconds):
+            print(f"Profiling for up to {seconds:g} s to {path}")
     
     def run(self):
         """Start the application"""
@@ -553,8 +954,30 @@ class DataConnectorGame:
     def on_closing(self):
         """Handle application closing"""
         self.stop_music()
+        self.profiler.stop()  # Writes out a capture still running
+        self.tasks.shutdown()
         self.root.destroy()
 
 if __name__ == "__main__":
-    game = DataConnectorGame()
+    import argparse
+    parser = argparse.ArgumentParser(description="Data Connector")
+    parser.add_argument("--sessions", type=int, default=1,
+                        help="number of game sessions (extra ones open in their own windows)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on localhost:PORT/metrics")
+    parser.add_argument("--metrics-file", default=None,
+                        help="rewrite Prometheus metrics to this file every 15 s")
+    parser.add_argument("--profile", type=float, default=None, metavar="SECONDS",
+                        help="sample the game for SECONDS and write collapsed stacks")
+    parser.add_argument("--profile-out", default=None,
+                        help="where --profile writes (default: profiles/profile-<time>.folded)")
+    args = parser.parse_args()
+    if args.metrics_port:
+        metrics.serve_http(port=args.metrics_port)
+    if args.metrics_file:
+        metrics.export_file_periodically(args.metrics_file)
+
+    game = DataConnectorGame(sessions=args.sessions)
+    if args.profile:
+        game.start_profiler(args.profile, args.profile_out)
     game.run()
@@ -0,0 +1,110 @@
+"""Startup benchmark - cold import time and time-to-first-frame
+
+Each measurement runs in a fresh interpreter so nothing is already cached.
+Exits with status 1 if a median goes over its threshold, so it can be used
+as a regression check:
+
+    python startup_benchmark.py --runs 7 --max-import-ms 40 --max-frame-ms 600
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GAME_MODULE = "sliding_puzzleUpdate26725_1141pmSource_Title_Music"
+
+# Imports the module and reports the time taken plus whether Tk came along
+IMPORT_SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+import {module}
+t1 = time.perf_counter()
+print((t1 - t0) * 1000.0, int('tkinter' in sys.modules))
+"""
+
+# Builds the game window and waits until the title screen has been drawn
+FRAME_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import {module}
+try:
+    game = {module}.DataConnectorGame()
+except Exception as e:
+    print('skip', type(e).__name__)
+    raise SystemExit(0)
+game.root.update_idletasks()
+game.root.update()
+t1 = time.perf_counter()
+game.on_closing()
+print((t1 - t0) * 1000.0)
+"""
+
+
+def run_snippet(snippet):
+    """Run a snippet in a fresh interpreter and return its stdout words"""
+    result = subprocess.run([sys.executable, "-c", snippet], cwd=HERE,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.split()
+
+
+def measure_import(module, runs):
+    """Median cold import time in ms, and whether tkinter got imported"""
+    times = []
+    pulled_tk = False
+    for _ in range(runs):
+        ms, has_tk = run_snippet(IMPORT_SNIPPET.format(module=module))
+        times.append(float(ms))
+        pulled_tk = pulled_tk or has_tk == "1"
+    return statistics.median(times), pulled_tk
+
+
+def measure_first_frame(runs):
+    """Median time from cold start to first drawn frame in ms (None if no display)"""
+    times = []
+    for _ in range(runs):
+        out = run_snippet(FRAME_SNIPPET.format(module=GAME_MODULE))
+        if out[0] == "skip":
+            return None
+        times.append(float(out[0]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Data Connector startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-import-ms", type=float, default=50.0,
+                        help="threshold for cold import of the puzzle logic")
+    parser.add_argument("--max-frame-ms", type=float, default=1000.0,
+                        help="threshold for cold start to first frame")
+    args = parser.parse_args()
+
+    failed = False
+
+    for module in ("circuit_logic", GAME_MODULE):
+        ms, pulled_tk = measure_import(module, args.runs)
+        status = "ok"
+        if ms > args.max_import_ms:
+            status = "REGRESSION"
+            failed = True
+        if pulled_tk:
+            status = "REGRESSION (imported tkinter)"
+            failed = True
+        print(f"import {module}: {ms:.1f} ms [{status}]")
+
+    frame_ms = measure_first_frame(args.runs)
+    if frame_ms is None:
+        print("first frame: skipped (no display)")
+    else:
+        status = "ok"
+        if frame_ms > args.max_frame_ms:
+            status = "REGRESSION"
+            failed = True
+        print(f"first frame: {frame_ms:.1f} ms [{status}]")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
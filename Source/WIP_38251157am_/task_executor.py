@@ -0,0 +1,110 @@
+"""Runs board logic off the Tk main thread"""
+import queue
+
+
+class TaskExecutor:
+    """Runs jobs in worker threads (or processes) and hands results back on the Tk thread
+
+    Jobs are submitted under a key such as 'test' or 'generate'. Submitting
+    again under the same key, or calling cancel(key), supersedes the older
+    job: it is cancelled if it hasn't started and its result is dropped if
+    it has. Finished jobs land on a queue that the Tk loop drains with an
+    `after` poll, which only runs while something is in flight.
+    """
+
+    def __init__(self, root, workers=1, use_processes=False, poll_ms=15):
+        self.root = root
+        self.poll_ms = poll_ms
+        # Imported here so loading the game module stays cheap
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if use_processes:
+            # Jobs must then be picklable module-level functions
+            self.pool = ProcessPoolExecutor(max_workers=workers)
+        else:
+            self.pool = ThreadPoolExecutor(max_workers=workers,
+                                           thread_name_prefix="board-worker")
+        self.results = queue.Queue()
+        self.generations = {}  # key -> generation of the newest job
+        self.futures = {}      # key -> future of the newest job
+        self.poll_id = None
+        self.suspended = False
+
+    def submit(self, key, fn, args=(), on_done=None, on_error=None):
+        """Run fn(*args) in the background, on_done(result) is called on the Tk thread"""
+        generation = self.cancel(key)
+        future = self.pool.submit(fn, *args)
+        self.futures[key] = future
+        # Runs in the worker (or a pool management thread), so only queue it
+        future.add_done_callback(
+            lambda f: self.results.put((key, generation, f, on_done, on_error)))
+        self._start_polling()
+        return future
+
+    def cancel(self, key):
+        """Supersede whatever is running under key, returns the next generation"""
+        generation = self.generations.get(key, 0) + 1
+        self.generations[key] = generation
+        future = self.futures.pop(key, None)
+        if future is not None:
+            future.cancel()  # Only succeeds if it hasn't started yet
+        return generation
+
+    def cancel_all(self):
+        """Supersede every job in flight"""
+        for key in list(self.futures):
+            self.cancel(key)
+
+    def busy(self, key=None):
+        """True if a job (under key, or any job) is still in flight"""
+        if key is None:
+            return bool(self.futures)
+        return key in self.futures
+
+    def suspend(self):
+        """Stop polling (jobs keep running, results wait on the queue)"""
+        self.suspended = True
+        if self.poll_id is not None:
+            self.root.after_cancel(self.poll_id)
+            self.poll_id = None
+
+    def resume(self):
+        """Start delivering results again"""
+        self.suspended = False
+        if self.futures:
+            self._start_polling()
+
+    def _start_polling(self):
+        if self.poll_id is None and not self.suspended:
+            self.poll_id = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Drain finished jobs and deliver the ones that are still current"""
+        self.poll_id = None
+        while True:
+            try:
+                key, generation, future, on_done, on_error = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if future.cancelled() or self.generations.get(key) != generation:
+                continue  # Stale - newer input already replaced it
+            del self.futures[key]
+            error = future.exception()
+            if error is not None:
+                if on_error:
+                    on_error(error)
+            elif on_done:
+                on_done(future.result())
+        # Keep polling only while there is something left to wait for
+        if self.futures:
+            self._start_polling()
+
+    def shutdown(self):
+        """Stop polling and let the workers finish in the background"""
+        self.cancel_all()
+        if self.poll_id is not None:
+            try:
+                self.root.after_cancel(self.poll_id)
+            except Exception:
+                pass
+            self.poll_id = None
+        self.pool.shutdown(wait=False, cancel_futures=True)